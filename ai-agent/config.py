@@ -19,21 +19,36 @@ class Settings(BaseSettings):
     gemini_model: str = "gemini-2.0-flash"
     llm_temperature: float = 0.0
     llm_max_output_tokens: int = 4096
+    llm_cache_size: int = 1024  # Exact-match diagnosis responses kept in memory
+    llm_cache_ttl: float = 600.0  # seconds to reuse a cached diagnosis; 0 disables
+    semantic_cache_enabled: bool = False  # Also reuse diagnoses for semantically similar errors
+    semantic_cache_size: int = 256
+    semantic_cache_threshold: float = 0.92  # Minimum cosine similarity for a hit
+    embedding_model: str = "models/embedding-001"
 
     # --- Vector DB ---
     chroma_persist_dir: str = "./chroma_db"
     runbook_dir: str = "./runbooks"
+    vector_search_enabled: bool = False  # Embed runbooks into Chroma; BM25 is used otherwise
 
     # --- Kubernetes ---
     k8s_log_tail_lines: int = 200
+    k8s_log_max_bytes: int = 32768  # Upper bound on log bytes kept per pod
     k8s_event_limit: int = 50
     k8s_in_cluster: bool = False  # Set True when deployed in EKS
+    k8s_max_concurrency: int = 6  # Max in-flight API server requests per process
+    k8s_connection_pool_size: int = 32  # Keep-alive connections held by the shared ApiClient
+    k8s_informers_enabled: bool = True  # Watch nodes/pods/HPAs/quotas into memory
+    k8s_resync_period: int = 60  # seconds; each watch ends and relists after this
+    k8s_health_cache_ttl: float = 5.0  # seconds to reuse cluster/namespace summaries; 0 disables
 
     # --- Server ---
     app_host: str = "0.0.0.0"
     app_port: int = 8000
+    app_workers: int = 2  # Worker processes for `python main.py`; each runs its own informers and caches
     cors_origins: str = "*"  # Comma-separated origins; restrict in prod
     log_level: str = "INFO"
+    dev_mode: bool = False  # Single auto-reloading worker for local development
 
     # --- Rate Limiting ---
     rate_limit_requests: int = 60  # requests per window
@@ -3,9 +3,13 @@ Deep Kubernetes data collector.
 Gathers pod status, events, deployments, node conditions, HPA, and resource quotas.
 """
 
+import time
+import asyncio
 import logging
-from typing import Dict, Any, List, Optional
-from kubernetes import client, config
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Callable, Awaitable, Tuple
+from kubernetes_asyncio import client, config, watch
 from config import settings
 
 logger = logging.getLogger(__name__)
@@ -15,35 +19,382 @@ logger = logging.getLogger(__name__)
 # ──────────────────────────────────────────────────────────────────────────────
 
 _k8s_available = False
-
-try:
-    if settings.k8s_in_cluster:
-        config.load_incluster_config()
-    else:
-        config.load_kube_config()
-    _k8s_available = True
-except Exception as e:
-    logger.warning(f"Kubernetes not available: {e}. K8s features disabled.")
+_api_client: Optional[client.ApiClient] = None
+
+# Per-API-group clients over the single shared ApiClient, so TCP+TLS
+# connections are pooled across requests. Set by init_k8s().
+CORE_V1: Optional[client.CoreV1Api] = None
+APPS_V1: Optional[client.AppsV1Api] = None
+AUTOSCALING_V1: Optional[client.AutoscalingV1Api] = None
+
+
+async def init_k8s() -> Optional[client.ApiClient]:
+    """
+    Load cluster credentials and create the shared ApiClient.
+    Called once from the app lifespan; every collector reuses the same client
+    (and its connection pool) instead of building one per call.
+    """
+    global _k8s_available, _api_client, CORE_V1, APPS_V1, AUTOSCALING_V1
+    try:
+        if settings.k8s_in_cluster:
+            config.load_incluster_config()
+        else:
+            await config.load_kube_config()
+        configuration = client.Configuration.get_default_copy()
+        configuration.connection_pool_maxsize = settings.k8s_connection_pool_size
+        _api_client = client.ApiClient(configuration)
+        CORE_V1 = client.CoreV1Api(_api_client)
+        APPS_V1 = client.AppsV1Api(_api_client)
+        AUTOSCALING_V1 = client.AutoscalingV1Api(_api_client)
+        _k8s_available = True
+    except Exception as e:
+        logger.warning(f"Kubernetes not available: {e}. K8s features disabled.")
+    return _api_client
+
+
+async def close_k8s() -> None:
+    """Close the shared ApiClient on shutdown."""
+    global _k8s_available, _api_client, CORE_V1, APPS_V1, AUTOSCALING_V1
+    if _api_client is not None:
+        await _api_client.close()
+    _api_client = None
+    CORE_V1 = APPS_V1 = AUTOSCALING_V1 = None
+    _k8s_available = False
 
 
 def is_k8s_available() -> bool:
     return _k8s_available
 
 
+# Caps concurrent request/response calls to the API server (long-lived watches
+# are not counted), so a burst of /diagnose requests cannot fan out unbounded.
+_k8s_semaphore = asyncio.Semaphore(settings.k8s_max_concurrency)
+
+
+# List from the API server's watch cache rather than a quorum read against etcd.
+# Not applied to event lists: "limit" is not honoured for cache-served lists.
+_CACHED_LIST_KWARGS: Dict[str, Any] = {
+    "resource_version": "0",
+    "resource_version_match": "NotOlderThan",
+    "_request_timeout": 10,
+}
+
+
+async def _call(fn: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+    """Run one K8s API call under the shared concurrency limit."""
+    async with _k8s_semaphore:
+        return await fn(*args, **kwargs)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Informer cache — cluster-wide objects mirrored in memory via list + watch
+# ──────────────────────────────────────────────────────────────────────────────
+
+class _Informer:
+    """
+    Keeps an in-memory copy of one resource kind, keyed by metadata.uid.
+    Lists once, then watches from the returned resourceVersion. Each watch is
+    bounded by k8s_resync_period, so the loop relists periodically and heals
+    any missed events; a 410 Gone also triggers a relist. The store is only
+    trusted while the last successful relist is recent, so callers fall back
+    to live API calls (and surface their errors) when the loop keeps failing.
+    """
+
+    def __init__(self, kind: str, list_fn: Callable[..., Awaitable[Any]]):
+        self.kind = kind
+        self.list_fn = list_fn
+        self.store: Dict[str, Any] = {}
+        self.last_synced: Optional[float] = None  # monotonic time of the last successful relist
+        self.lock = asyncio.Lock()
+
+    @property
+    def synced(self) -> bool:
+        # Healthy loops relist every k8s_resync_period; allow one missed cycle
+        return (
+            self.last_synced is not None
+            and time.monotonic() - self.last_synced < 2 * settings.k8s_resync_period
+        )
+
+    async def items(self) -> List[Any]:
+        async with self.lock:
+            return list(self.store.values())
+
+    async def run(self) -> None:
+        while True:
+            try:
+                resource_version = await self._relist()
+                await self._watch(resource_version)
+            except asyncio.CancelledError:
+                raise
+            except client.ApiException as e:
+                if e.status != 410:
+                    logger.warning(f"{self.kind} informer error: {e.reason}")
+                    self.last_synced = None
+                    await asyncio.sleep(5)
+            except Exception as e:
+                logger.warning(f"{self.kind} informer error: {e}")
+                self.last_synced = None
+                await asyncio.sleep(5)
+
+    async def _relist(self) -> str:
+        resp = await _call(self.list_fn, **_CACHED_LIST_KWARGS)
+        store = {obj.metadata.uid: obj for obj in resp.items}
+        async with self.lock:
+            for uid in self.store.keys() - store.keys():
+                _summary_cache.pop(uid, None)
+            self.store = store
+            self.last_synced = time.monotonic()
+        return resp.metadata.resource_version
+
+    async def _watch(self, resource_version: str) -> None:
+        async with watch.Watch() as w:
+            async for event in w.stream(
+                self.list_fn,
+                resource_version=resource_version,
+                timeout_seconds=settings.k8s_resync_period,
+                allow_watch_bookmarks=True,
+            ):
+                if event["type"] == "BOOKMARK":
+                    continue  # Only advances the watch's resourceVersion
+                obj = event["object"]
+                async with self.lock:
+                    if event["type"] == "DELETED":
+                        self.store.pop(obj.metadata.uid, None)
+                        _summary_cache.pop(obj.metadata.uid, None)
+                    else:
+                        self.store[obj.metadata.uid] = obj
+
+
+_informers: Dict[str, _Informer] = {}
+_informer_tasks: List[asyncio.Task] = []
+
+
+def start_informers() -> None:
+    """Spawn the background watchers. Called from the app lifespan."""
+    if not _k8s_available or not settings.k8s_informers_enabled or _informer_tasks:
+        return
+
+    _informers.update({
+        "nodes": _Informer("nodes", CORE_V1.list_node),
+        "pods": _Informer("pods", CORE_V1.list_pod_for_all_namespaces),
+        "hpas": _Informer("hpas", AUTOSCALING_V1.list_horizontal_pod_autoscaler_for_all_namespaces),
+        "quotas": _Informer("quotas", CORE_V1.list_resource_quota_for_all_namespaces),
+    })
+    for informer in _informers.values():
+        _informer_tasks.append(asyncio.create_task(informer.run(), name=f"informer-{informer.kind}"))
+
+
+async def stop_informers() -> None:
+    """Cancel the background watchers and drop their caches."""
+    for task in _informer_tasks:
+        task.cancel()
+    await asyncio.gather(*_informer_tasks, return_exceptions=True)
+    _informer_tasks.clear()
+    _informers.clear()
+
+
+# Summaries built from informer objects, keyed by uid and reused until the
+# object's resourceVersion changes. (metadata.generation is not bumped by pod or
+# node status updates, so it cannot be used to detect restarts/readiness flips.)
+# The API-list fallback never sees deletions, so the cache is bounded as an LRU.
+_SUMMARY_CACHE_MAX = 10000
+_summary_cache: "OrderedDict[str, tuple]" = OrderedDict()
+
+
+def _memoized_summary(obj: Any, build: Callable[[Any], Dict[str, Any]]) -> Dict[str, Any]:
+    """Return the cached summary for obj, rebuilding only when it has changed."""
+    uid = obj.metadata.uid
+    version = obj.metadata.resource_version
+    cached = _summary_cache.get(uid)
+    if cached is not None and cached[0] == version:
+        _summary_cache.move_to_end(uid)
+        return cached[1]
+    summary = build(obj)
+    _summary_cache[uid] = (version, summary)
+    _summary_cache.move_to_end(uid)
+    while len(_summary_cache) > _SUMMARY_CACHE_MAX:
+        _summary_cache.popitem(last=False)
+    return summary
+
+
+async def _list_items(kind: str, list_fn: Callable[..., Awaitable[Any]], **kwargs) -> List[Any]:
+    """Serve from the informer cache once synced; otherwise list from the API server."""
+    informer = _informers.get(kind)
+    if informer is not None and informer.synced:
+        return await informer.items()
+    return (await _call(list_fn, **_CACHED_LIST_KWARGS, **kwargs)).items
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Short-lived result cache — dashboards poll far more often than the data changes
+# ──────────────────────────────────────────────────────────────────────────────
+
+# Keys include the client-supplied namespace, so entries are pruned on store and capped.
+_RESULT_CACHE_MAX_KEYS = 256
+_result_cache: Dict[Tuple[str, ...], Tuple[float, Dict[str, Any]]] = {}
+_result_locks: Dict[Tuple[str, ...], asyncio.Lock] = {}
+
+
+def _store_result(key: Tuple[str, ...], result: Dict[str, Any], ttl: float) -> None:
+    """Store result, dropping expired entries and the oldest ones beyond the key cap."""
+    now = time.monotonic()
+    for k in [k for k, (stored_at, _) in _result_cache.items() if now - stored_at >= ttl]:
+        del _result_cache[k]
+    _result_cache.pop(key, None)
+    _result_cache[key] = (now, result)
+    while len(_result_cache) > _RESULT_CACHE_MAX_KEYS:
+        del _result_cache[next(iter(_result_cache))]
+    for k in [k for k, lock in _result_locks.items() if k not in _result_cache and not lock.locked()]:
+        del _result_locks[k]
+
+
+async def _ttl_cached(key: Tuple[str, ...], fetch: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+    """
+    Return a result younger than k8s_health_cache_ttl, or fetch a new one.
+    Concurrent misses for the same key wait on one in-flight fetch (single-flight).
+    """
+    ttl = settings.k8s_health_cache_ttl
+    if ttl <= 0:
+        return await fetch()
+
+    cached = _result_cache.get(key)
+    if cached is not None and time.monotonic() - cached[0] < ttl:
+        return cached[1]
+
+    async with _result_locks.setdefault(key, asyncio.Lock()):
+        cached = _result_cache.get(key)
+        if cached is not None and time.monotonic() - cached[0] < ttl:
+            return cached[1]
+        result = await fetch()
+        _store_result(key, result, ttl)
+        return result
+
+
 # ──────────────────────────────────────────────────────────────────────────────
 # Pod-level collection
 # ──────────────────────────────────────────────────────────────────────────────
 
-def collect_pod_details(pod_name: str, namespace: str = "default") -> Dict[str, Any]:
+_LOG_CHUNK_SIZE = 16384
+
+
+async def _read_log_tail(v1: client.CoreV1Api, pod_name: str, namespace: str) -> str:
+    """
+    Stream pod logs in chunks and keep only the last k8s_log_max_bytes,
+    instead of materializing the whole response body as one string.
+    """
+    limit = settings.k8s_log_max_bytes
+    tail = bytearray()
+    partial_first_line = False
+
+    # Hold the concurrency slot until the body has been fully read
+    async with _k8s_semaphore:
+        resp = await v1.read_namespaced_pod_log(
+            name=pod_name, namespace=namespace,
+            tail_lines=settings.k8s_log_tail_lines,
+            _preload_content=False,
+        )
+        try:
+            if not 200 <= resp.status <= 299:
+                raise client.ApiException(status=resp.status, reason=resp.reason)
+
+            async for chunk in resp.content.iter_chunked(_LOG_CHUNK_SIZE):
+                tail += chunk
+                if len(tail) > limit:
+                    cut = len(tail) - limit
+                    # A cut right after a newline leaves a complete first line
+                    partial_first_line = tail[cut - 1] != ord("\n")
+                    del tail[:cut]
+        finally:
+            resp.release()
+
+    if partial_first_line:
+        # Drop the partial first line left by the byte cut
+        del tail[:tail.find(b"\n") + 1]
+    return tail.decode("utf-8", errors="replace")
+
+
+def _build_container_info(cs: Any) -> Dict[str, Any]:
+    """Summarize one V1ContainerStatus."""
+    container_info = {
+        "name": cs.name,
+        "ready": cs.ready,
+        "restart_count": cs.restart_count,
+        "image": cs.image,
+    }
+    state = cs.state
+    if state:
+        if state.waiting:
+            container_info["state"] = "Waiting"
+            container_info["reason"] = state.waiting.reason
+            container_info["message"] = state.waiting.message
+        elif state.terminated:
+            container_info["state"] = "Terminated"
+            container_info["reason"] = state.terminated.reason
+            container_info["exit_code"] = state.terminated.exit_code
+            container_info["message"] = state.terminated.message
+        elif state.running:
+            container_info["state"] = "Running"
+            container_info["started_at"] = state.running.started_at
+
+    if cs.last_state and cs.last_state.terminated:
+        last = cs.last_state.terminated
+        container_info["last_termination"] = {
+            "reason": last.reason,
+            "exit_code": last.exit_code,
+            "message": last.message,
+            "finished_at": last.finished_at,
+        }
+    return container_info
+
+
+def _build_resource_info(c: Any) -> Dict[str, Any]:
+    """Summarize requests/limits from one V1Container spec."""
+    res = {"name": c.name}
+    if c.resources:
+        res["requests"] = dict(c.resources.requests) if c.resources.requests else {}
+        res["limits"] = dict(c.resources.limits) if c.resources.limits else {}
+    return res
+
+
+def _build_event_info(e: Any) -> Dict[str, Any]:
+    """Summarize one CoreV1Event attached to a pod."""
+    return {
+        "type": e.type,
+        "reason": e.reason,
+        "message": e.message,
+        "count": e.count,
+        "first_seen": e.first_timestamp,
+        "last_seen": e.last_timestamp,
+        "source": e.source.component if e.source else None,
+    }
+
+
+async def collect_pod_details(pod_name: str, namespace: str = "default") -> Dict[str, Any]:
     """Collect deep details about a specific pod."""
     if not _k8s_available:
         return {"error": "Kubernetes not available"}
 
-    v1 = client.CoreV1Api()
     result: Dict[str, Any] = {}
 
-    try:
-        pod = v1.read_namespaced_pod(name=pod_name, namespace=namespace)
+    # Pod, logs and events are independent round-trips — issue them concurrently
+    pod, logs, events = await asyncio.gather(
+        _call(CORE_V1.read_namespaced_pod, name=pod_name, namespace=namespace),
+        _read_log_tail(CORE_V1, pod_name, namespace),
+        _call(
+            CORE_V1.list_namespaced_event,
+            namespace=namespace,
+            field_selector=f"involvedObject.name={pod_name}",
+            limit=settings.k8s_event_limit,
+        ),
+        return_exceptions=True,
+    )
+    for outcome in (pod, logs, events):
+        if isinstance(outcome, BaseException) and not isinstance(outcome, client.ApiException):
+            raise outcome
+
+    if isinstance(pod, client.ApiException):
+        result["error"] = f"Failed to fetch pod: {pod.reason}"
+    else:
         status = pod.status
 
         # Basic info
@@ -52,86 +403,25 @@ def collect_pod_details(pod_name: str, namespace: str = "default") -> Dict[str,
         result["phase"] = status.phase
         result["host_ip"] = status.host_ip
         result["pod_ip"] = status.pod_ip
-        result["start_time"] = str(status.start_time) if status.start_time else None
+        result["start_time"] = status.start_time
 
         # Container statuses
-        containers = []
-        for cs in (status.container_statuses or []):
-            container_info = {
-                "name": cs.name,
-                "ready": cs.ready,
-                "restart_count": cs.restart_count,
-                "image": cs.image,
-            }
-            if cs.state:
-                if cs.state.waiting:
-                    container_info["state"] = "Waiting"
-                    container_info["reason"] = cs.state.waiting.reason
-                    container_info["message"] = cs.state.waiting.message
-                elif cs.state.terminated:
-                    container_info["state"] = "Terminated"
-                    container_info["reason"] = cs.state.terminated.reason
-                    container_info["exit_code"] = cs.state.terminated.exit_code
-                    container_info["message"] = cs.state.terminated.message
-                elif cs.state.running:
-                    container_info["state"] = "Running"
-                    container_info["started_at"] = str(cs.state.running.started_at)
-
-            if cs.last_state and cs.last_state.terminated:
-                container_info["last_termination"] = {
-                    "reason": cs.last_state.terminated.reason,
-                    "exit_code": cs.last_state.terminated.exit_code,
-                    "message": cs.last_state.terminated.message,
-                    "finished_at": str(cs.last_state.terminated.finished_at),
-                }
-            containers.append(container_info)
-
-        result["containers"] = containers
+        result["containers"] = [_build_container_info(cs) for cs in (status.container_statuses or [])]
 
         # Resource requests/limits from spec
-        resource_info = []
-        for c in (pod.spec.containers or []):
-            res = {"name": c.name}
-            if c.resources:
-                res["requests"] = dict(c.resources.requests) if c.resources.requests else {}
-                res["limits"] = dict(c.resources.limits) if c.resources.limits else {}
-            resource_info.append(res)
-        result["resource_spec"] = resource_info
-
-    except client.ApiException as e:
-        result["error"] = f"Failed to fetch pod: {e.reason}"
+        result["resource_spec"] = [_build_resource_info(c) for c in (pod.spec.containers or [])]
 
     # Pod logs (last N lines)
-    try:
-        logs = v1.read_namespaced_pod_log(
-            name=pod_name, namespace=namespace,
-            tail_lines=settings.k8s_log_tail_lines
-        )
-        result["recent_logs"] = logs
-    except client.ApiException:
+    if isinstance(logs, client.ApiException):
         result["recent_logs"] = "[Could not fetch logs]"
+    else:
+        result["recent_logs"] = logs
 
     # Pod events
-    try:
-        events = v1.list_namespaced_event(
-            namespace=namespace,
-            field_selector=f"involvedObject.name={pod_name}",
-            limit=settings.k8s_event_limit,
-        )
-        result["events"] = [
-            {
-                "type": e.type,
-                "reason": e.reason,
-                "message": e.message,
-                "count": e.count,
-                "first_seen": str(e.first_timestamp),
-                "last_seen": str(e.last_timestamp),
-                "source": e.source.component if e.source else None,
-            }
-            for e in events.items
-        ]
-    except client.ApiException:
+    if isinstance(events, client.ApiException):
         result["events"] = []
+    else:
+        result["events"] = [_build_event_info(e) for e in events.items]
 
     return result
 
@@ -140,16 +430,15 @@ def collect_pod_details(pod_name: str, namespace: str = "default") -> Dict[str,
 # Deployment-level collection
 # ──────────────────────────────────────────────────────────────────────────────
 
-def collect_deployment_details(deployment_name: str, namespace: str = "default") -> Dict[str, Any]:
+async def collect_deployment_details(deployment_name: str, namespace: str = "default") -> Dict[str, Any]:
     """Collect rollout status and replica info for a deployment."""
     if not _k8s_available:
         return {"error": "Kubernetes not available"}
 
-    apps_v1 = client.AppsV1Api()
     result: Dict[str, Any] = {}
 
     try:
-        dep = apps_v1.read_namespaced_deployment(name=deployment_name, namespace=namespace)
+        dep = await _call(APPS_V1.read_namespaced_deployment, name=deployment_name, namespace=namespace)
         result["name"] = deployment_name
         result["namespace"] = namespace
         result["replicas_desired"] = dep.spec.replicas
@@ -178,30 +467,49 @@ def collect_deployment_details(deployment_name: str, namespace: str = "default")
 # Namespace-wide collection
 # ──────────────────────────────────────────────────────────────────────────────
 
-def collect_namespace_overview(namespace: str = "default") -> Dict[str, Any]:
+@dataclass(slots=True)
+class WarnEvent:
+    """Warning event in a namespace overview (slotted: no per-instance dict)."""
+    reason: str
+    message: str
+    object: str
+    count: int
+
+
+def _summarize_pod(pod: Any) -> Dict[str, Any]:
+    return {
+        "name": pod.metadata.name,
+        "phase": pod.status.phase,
+        "restarts": sum(
+            (cs.restart_count or 0)
+            for cs in (pod.status.container_statuses or [])
+        ),
+        "ready": all(
+            cs.ready for cs in (pod.status.container_statuses or [])
+        ) if pod.status.container_statuses else False,
+    }
+
+
+async def collect_namespace_overview(namespace: str = "default") -> Dict[str, Any]:
     """Collect a summary of all pods and events in a namespace."""
     if not _k8s_available:
         return {"error": "Kubernetes not available"}
 
-    v1 = client.CoreV1Api()
+    return await _ttl_cached(("namespace", namespace), lambda: _collect_namespace_overview(namespace))
+
+
+async def _collect_namespace_overview(namespace: str) -> Dict[str, Any]:
     result: Dict[str, Any] = {"namespace": namespace}
 
     try:
-        pods = v1.list_namespaced_pod(namespace=namespace)
+        if "pods" in _informers and _informers["pods"].synced:
+            pods = [p for p in await _informers["pods"].items() if p.metadata.namespace == namespace]
+        else:
+            pods = (await _call(CORE_V1.list_namespaced_pod, namespace=namespace, **_CACHED_LIST_KWARGS)).items
         pod_summaries = []
         unhealthy = []
-        for pod in pods.items:
-            summary = {
-                "name": pod.metadata.name,
-                "phase": pod.status.phase,
-                "restarts": sum(
-                    (cs.restart_count or 0)
-                    for cs in (pod.status.container_statuses or [])
-                ),
-                "ready": all(
-                    cs.ready for cs in (pod.status.container_statuses or [])
-                ) if pod.status.container_statuses else False,
-            }
+        for pod in pods:
+            summary = _memoized_summary(pod, _summarize_pod)
             pod_summaries.append(summary)
             if summary["phase"] != "Running" or not summary["ready"] or summary["restarts"] > 3:
                 unhealthy.append(summary)
@@ -214,13 +522,14 @@ def collect_namespace_overview(namespace: str = "default") -> Dict[str, Any]:
 
     # Warning events
     try:
-        events = v1.list_namespaced_event(
+        events = await _call(
+            CORE_V1.list_namespaced_event,
             namespace=namespace,
             field_selector="type=Warning",
             limit=settings.k8s_event_limit,
         )
         result["warning_events"] = [
-            {"reason": e.reason, "message": e.message, "object": e.involved_object.name, "count": e.count}
+            WarnEvent(e.reason, e.message, e.involved_object.name, e.count)
             for e in events.items
         ]
     except client.ApiException:
@@ -233,31 +542,36 @@ def collect_namespace_overview(namespace: str = "default") -> Dict[str, Any]:
 # Cluster-wide health
 # ──────────────────────────────────────────────────────────────────────────────
 
-def collect_cluster_health() -> Dict[str, Any]:
-    """Collect cluster-wide node health, HPA, and resource quotas."""
+def _summarize_node(node: Any) -> Dict[str, Any]:
+    conditions = {c.type: c.status for c in (node.status.conditions or [])}
+    return {
+        "name": node.metadata.name,
+        "ready": conditions.get("Ready", "Unknown"),
+        "memory_pressure": conditions.get("MemoryPressure", "False") == "True",
+        "disk_pressure": conditions.get("DiskPressure", "False") == "True",
+        "pid_pressure": conditions.get("PIDPressure", "False") == "True",
+        "allocatable_cpu": node.status.allocatable.get("cpu", "?") if node.status.allocatable else "?",
+        "allocatable_memory": node.status.allocatable.get("memory", "?") if node.status.allocatable else "?",
+    }
+
+
+async def collect_cluster_health() -> Dict[str, Any]:
+    """Collect cluster-wide node health, HPA, and resource quotas (served from the informer cache when synced)."""
     if not _k8s_available:
         return {"error": "Kubernetes not available"}
 
-    v1 = client.CoreV1Api()
-    autoscaling_v1 = client.AutoscalingV1Api()
+    return await _ttl_cached(("cluster",), _collect_cluster_health)
+
+
+async def _collect_cluster_health() -> Dict[str, Any]:
     result: Dict[str, Any] = {}
 
     # Nodes
     try:
-        nodes = v1.list_node()
+        nodes = await _list_items("nodes", CORE_V1.list_node)
         node_list = []
-        for node in nodes.items:
-            conditions = {c.type: c.status for c in (node.status.conditions or [])}
-            node_info = {
-                "name": node.metadata.name,
-                "ready": conditions.get("Ready", "Unknown"),
-                "memory_pressure": conditions.get("MemoryPressure", "False") == "True",
-                "disk_pressure": conditions.get("DiskPressure", "False") == "True",
-                "pid_pressure": conditions.get("PIDPressure", "False") == "True",
-                "allocatable_cpu": node.status.allocatable.get("cpu", "?") if node.status.allocatable else "?",
-                "allocatable_memory": node.status.allocatable.get("memory", "?") if node.status.allocatable else "?",
-            }
-            node_list.append(node_info)
+        for node in nodes:
+            node_list.append(_memoized_summary(node, _summarize_node))
         result["nodes"] = node_list
         result["total_nodes"] = len(node_list)
         result["ready_nodes"] = sum(1 for n in node_list if n["ready"] == "True")
@@ -266,9 +580,9 @@ def collect_cluster_health() -> Dict[str, Any]:
 
     # HPAs across all namespaces
     try:
-        hpas = autoscaling_v1.list_horizontal_pod_autoscaler_for_all_namespaces()
+        hpas = await _list_items("hpas", AUTOSCALING_V1.list_horizontal_pod_autoscaler_for_all_namespaces)
         hpa_list = []
-        for hpa in hpas.items:
+        for hpa in hpas:
             hpa_list.append({
                 "name": hpa.metadata.name,
                 "namespace": hpa.metadata.namespace,
@@ -285,9 +599,9 @@ def collect_cluster_health() -> Dict[str, Any]:
 
     # Resource Quotas across all namespaces
     try:
-        quotas = v1.list_resource_quota_for_all_namespaces()
+        quotas = await _list_items("quotas", CORE_V1.list_resource_quota_for_all_namespaces)
         quota_list = []
-        for q in quotas.items:
+        for q in quotas:
             quota_list.append({
                 "name": q.metadata.name,
                 "namespace": q.metadata.namespace,
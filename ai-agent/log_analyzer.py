@@ -5,10 +5,19 @@ and assign severity levels BEFORE sending to the LLM.
 """
 
 import re
+import hashlib
 import logging
-from typing import List, Dict, Any
+import functools
+import threading
+from collections import OrderedDict
+from typing import List, Dict, Any, Callable, Iterable, Tuple
 from models import Severity, ErrorCategory
 
+try:
+    import hyperscan
+except ImportError:  # optional accelerator — falls back to per-pattern regex search
+    hyperscan = None
+
 logger = logging.getLogger(__name__)
 
 
@@ -103,6 +112,116 @@ ERROR_PATTERNS: List[Dict[str, Any]] = [
 ]
 
 
+# Lowercase literals of which every pattern above requires at least one. A plain
+# substring check rejects the common no-error text before any regex runs.
+# Keep in sync with ERROR_PATTERNS.
+LITERAL_PREFILTER = (
+    "oomkilled", "crashloopbackoff", "imagepull", "createcontainerconfigerror",
+    "readiness", "liveness", "quota", "forbidden", "unauthorized", "403", "rbac",
+    "refused", "timeout", "etimedout", "unreachable", "lock", "conditionalcheckfailedexception",
+    "provider", "expiredtoken", "invalidclienttokenid", "exit", "permission", "eacces",
+)
+
+# Sort rank per severity value (CRITICAL first) and value -> enum lookup
+_SEVERITY_ORDER: Dict[str, int] = {
+    Severity.CRITICAL.value: 0,
+    Severity.HIGH.value: 1,
+    Severity.MEDIUM.value: 2,
+    Severity.LOW.value: 3,
+    Severity.INFO.value: 4,
+}
+_SEVERITY_MAP: Dict[str, Severity] = {s.value: s for s in Severity}
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Multi-pattern prefilter — which patterns occur in the text
+# ──────────────────────────────────────────────────────────────────────────────
+
+def _compile_hyperscan_db():
+    """Compile ERROR_PATTERNS into a single Hyperscan database, if available."""
+    if hyperscan is None:
+        return None
+    try:
+        db = hyperscan.Database()
+        db.compile(
+            expressions=[entry["pattern"].pattern.encode() for entry in ERROR_PATTERNS],
+            ids=list(range(len(ERROR_PATTERNS))),
+            elements=len(ERROR_PATTERNS),
+            flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH] * len(ERROR_PATTERNS),
+        )
+        return db
+    except Exception as e:
+        logger.warning(f"Hyperscan database compilation failed: {e}. Using per-pattern regex search.")
+        return None
+
+
+_HS_DB = _compile_hyperscan_db()
+_hs_local = threading.local()  # Hyperscan scratch space is not thread-safe
+
+
+def _matching_pattern_indexes(text: str) -> Iterable[int]:
+    """
+    Indexes of ERROR_PATTERNS that occur in text: one Hyperscan pass when
+    available, otherwise a search per pattern. (A single alternation regex is
+    not a substitute — it reports only the first alternative matching at each
+    offset, dropping other patterns that start there.)
+    """
+    if _HS_DB is None:
+        return [i for i, entry in enumerate(ERROR_PATTERNS) if entry["pattern"].search(text)]
+
+    scratch = getattr(_hs_local, "scratch", None)
+    if scratch is None:
+        scratch = _hs_local.scratch = hyperscan.Scratch(_HS_DB)
+
+    hits = set()
+    _HS_DB.scan(
+        text.encode(),
+        match_event_handler=lambda pattern_id, start, end, flags, ctx: hits.add(pattern_id),
+        scratch=scratch,
+    )
+    return sorted(hits)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Digest-keyed memoization
+# ──────────────────────────────────────────────────────────────────────────────
+
+def digest_lru_cache(maxsize: int) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """
+    LRU memoization for functions whose first argument is an arbitrarily large
+    string (raw logs). Entries are keyed on a 16-byte blake2b digest of it, so
+    the cache holds at most maxsize small keys instead of copies of the inputs.
+    Like functools.lru_cache, the wrapper exposes cache_clear().
+    """
+    def decorator(fn: Callable[..., Any]) -> Callable[..., Any]:
+        cache: "OrderedDict[tuple, Any]" = OrderedDict()
+        lock = threading.Lock()
+
+        @functools.wraps(fn)
+        def wrapper(text: str, *args: Any) -> Any:
+            key = (hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest(), *args)
+            with lock:
+                if key in cache:
+                    cache.move_to_end(key)
+                    return cache[key]
+            result = fn(text, *args)
+            with lock:
+                cache[key] = result
+                cache.move_to_end(key)
+                while len(cache) > maxsize:
+                    cache.popitem(last=False)
+            return result
+
+        def cache_clear() -> None:
+            with lock:
+                cache.clear()
+
+        wrapper.cache_clear = cache_clear
+        return wrapper
+
+    return decorator
+
+
 # ──────────────────────────────────────────────────────────────────────────────
 # Classifier
 # ──────────────────────────────────────────────────────────────────────────────
@@ -111,11 +230,23 @@ def classify_errors(text: str) -> List[Dict[str, Any]]:
     """
     Scan text against known error patterns and return classified matches.
     Returns a list of dicts with: category, severity, hint, matched_text.
+    Results are memoized per text (retries and polls resend the same error).
     """
+    return [dict(c) for c in _classify_cached(text)]
+
+
+@digest_lru_cache(maxsize=2048)
+def _classify_cached(text: str) -> Tuple[Dict[str, Any], ...]:
+    text_lower = text.lower()
+    if not any(token in text_lower for token in LITERAL_PREFILTER):
+        return ()
+
     classifications = []
     seen_categories = set()
 
-    for entry in ERROR_PATTERNS:
+    # Only patterns that hit in the prefilter pay for findall (matched_text/match_count)
+    for index in _matching_pattern_indexes(text):
+        entry = ERROR_PATTERNS[index]
         matches = entry["pattern"].findall(text)
         if matches and entry["category"] not in seen_categories:
             seen_categories.add(entry["category"])
@@ -128,24 +259,16 @@ def classify_errors(text: str) -> List[Dict[str, Any]]:
             })
 
     # Sort by severity (CRITICAL first)
-    severity_order = {
-        Severity.CRITICAL.value: 0,
-        Severity.HIGH.value: 1,
-        Severity.MEDIUM.value: 2,
-        Severity.LOW.value: 3,
-        Severity.INFO.value: 4,
-    }
-    classifications.sort(key=lambda x: severity_order.get(x["severity"], 5))
+    classifications.sort(key=lambda x: _SEVERITY_ORDER.get(x["severity"], 5))
 
-    return classifications
+    return tuple(classifications)
 
 
 def get_highest_severity(classifications: List[Dict[str, Any]]) -> Severity:
     """Return the highest severity from a list of classifications (list is pre-sorted)."""
     if not classifications:
         return Severity.INFO
-    severity_map = {s.value: s for s in Severity}
-    return severity_map.get(classifications[0]["severity"], Severity.INFO)
+    return _SEVERITY_MAP.get(classifications[0]["severity"], Severity.INFO)
 
 
 def format_classifications_for_prompt(classifications: List[Dict[str, Any]]) -> str:
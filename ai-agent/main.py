@@ -8,11 +8,18 @@ Endpoints:
 """
 
 import uuid
+import asyncio
 import logging
 from contextlib import asynccontextmanager
+from typing import Any, Callable, Dict, Type, TypeVar
 
-from fastapi import FastAPI, HTTPException, Request
+import orjson
+
+from fastapi import Depends, FastAPI, HTTPException, Request
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, ValidationError
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
@@ -25,12 +32,13 @@ from models import (
     Severity, ErrorCategory,
 )
 from k8s_collector import (
+    init_k8s, close_k8s, start_informers, stop_informers,
     is_k8s_available, collect_pod_details,
     collect_deployment_details, collect_namespace_overview,
     collect_cluster_health,
 )
 from log_analyzer import classify_errors, get_highest_severity
-from rag_chain import analyze_devops_issue, search_runbooks
+from rag_chain import analyze_devops_issue, load_runbooks, search_runbooks
 
 # ──────────────────────────────────────────────────────────────────────────────
 # Logging
@@ -51,13 +59,29 @@ logger = logging.getLogger(__name__)
 async def lifespan(app: FastAPI):
     """Startup & shutdown tasks."""
     logger.info("🚀 AI DevOps Assistant starting up...")
+    app.state.k8s_api_client = await init_k8s()
+    start_informers()
+    # Load runbooks (and sync the vector index, if enabled) before serving, off the event loop
+    await asyncio.to_thread(load_runbooks)
     logger.info(f"   Gemini Model : {settings.gemini_model}")
     logger.info(f"   K8s Available: {is_k8s_available()}")
     logger.info(f"   API Key Set  : {'Yes' if settings.google_api_key else 'No (mock mode)'}")
     yield
+    await stop_informers()
+    await close_k8s()
     logger.info("AI DevOps Assistant shutting down.")
 
 
+class UTCORJSONResponse(ORJSONResponse):
+    """ORJSONResponse that also serializes naive datetimes as UTC (K8s timestamps are passed through raw)."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NAIVE_UTC,
+        )
+
+
 limiter = Limiter(key_func=get_remote_address)
 
 app = FastAPI(
@@ -65,27 +89,82 @@ app = FastAPI(
     description="Production-grade AI-powered DevOps diagnostics engine",
     version="2.0.0",
     lifespan=lifespan,
+    default_response_class=UTCORJSONResponse,
 )
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
-# CORS
+# CORS — a bare "*" without credentials lets the middleware send a constant
+# header instead of echoing each request's Origin back
+cors_origins = tuple(o.strip() for o in settings.cors_origins.split(",") if o.strip())
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=settings.cors_origins.split(","),
-    allow_credentials=True,
+    allow_origins=list(cors_origins),
+    allow_credentials=cors_origins != ("*",),
     allow_methods=["*"],
     allow_headers=["*"],
 )
 
 
+# ──────────────────────────────────────────────────────────────────────────────
+# Request body parsing
+# ──────────────────────────────────────────────────────────────────────────────
+
+_ModelT = TypeVar("_ModelT", bound=BaseModel)
+
+
+def _json_body(model: Type[_ModelT]) -> Callable[[Request], Any]:
+    """
+    Dependency that validates the raw request body with model_validate_json,
+    skipping FastAPI's json.loads-then-validate path. Errors still surface as 422.
+    """
+    async def parse(request: Request) -> _ModelT:
+        try:
+            return model.model_validate_json(await request.body())
+        except ValidationError as e:
+            raise RequestValidationError(
+                [{**err, "loc": ("body", *err["loc"])} for err in e.errors(include_url=False, include_context=False)]
+            ) from e
+
+    return parse
+
+
+def _body_schema(model: Type[BaseModel]) -> Dict[str, Any]:
+    """openapi_extra documenting a body parsed by _json_body."""
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": model.model_json_schema()}},
+        }
+    }
+
+
+# Module-level so each endpoint shares one dependency instance.
+_DIAGNOSE_BODY = Depends(_json_body(DiagnoseRequest))
+_RUNBOOK_BODY = Depends(_json_body(RunbookRequest))
+
+
 # ──────────────────────────────────────────────────────────────────────────────
 # POST /diagnose — Primary endpoint
 # ──────────────────────────────────────────────────────────────────────────────
 
+_SEVERITY_BY_VALUE = Severity._value2member_map_
+_CATEGORY_BY_VALUE = ErrorCategory._value2member_map_
+
+
+async def _none() -> None:
+    """Placeholder awaitable for K8s fetches that were not requested."""
+    return None
+
+
 @limiter.limit(f"{settings.rate_limit_requests}/minute")
-@app.post("/diagnose", response_model=DiagnoseResponse)
-async def diagnose(request: Request, body: DiagnoseRequest):
+@app.post(
+    "/diagnose",
+    response_model=None,
+    responses={200: {"model": DiagnoseResponse}},
+    openapi_extra=_body_schema(DiagnoseRequest),
+)
+async def diagnose(request: Request, body: DiagnoseRequest = _DIAGNOSE_BODY):
     """
     Full diagnostic pipeline:
     1. Classify errors from the raw message
@@ -101,69 +180,73 @@ async def diagnose(request: Request, body: DiagnoseRequest):
         classifications = classify_errors(body.error_message)
         logger.info(f"[{request_id}] Classified {len(classifications)} error patterns")
 
-        # Step 2: Collect K8s data if available
+        # Step 2: Collect K8s data if available (independent fetches run concurrently)
         k8s_data = {}
         if is_k8s_available():
-            if body.pod_name:
-                k8s_data = collect_pod_details(body.pod_name, body.namespace)
+            pod_data, dep_data, ns_data = await asyncio.gather(
+                collect_pod_details(body.pod_name, body.namespace) if body.pod_name else _none(),
+                collect_deployment_details(body.deployment_name, body.namespace) if body.deployment_name else _none(),
+                collect_namespace_overview(body.namespace) if body.include_cluster_health else _none(),
+            )
+
+            if pod_data is not None:
+                k8s_data = pod_data
                 logger.info(f"[{request_id}] Collected pod details for {body.pod_name}")
 
-            if body.deployment_name:
-                dep_data = collect_deployment_details(body.deployment_name, body.namespace)
+            if dep_data is not None:
                 k8s_data.update(dep_data)
                 logger.info(f"[{request_id}] Collected deployment details for {body.deployment_name}")
 
-            if body.include_cluster_health:
-                ns_data = collect_namespace_overview(body.namespace)
+            if ns_data is not None:
                 k8s_data["namespace_overview"] = ns_data
 
         # Step 3: RAG analysis
-        analysis = analyze_devops_issue(
+        analysis = await analyze_devops_issue(
             error_context=body.error_message,
             classifications=classifications,
             k8s_data=k8s_data if k8s_data else None,
+            cacheable=not k8s_data,
         )
 
         # Step 4: Build structured response
+        # Fields are coerced to their declared types here, so model_construct can skip validation
         fix_commands = [
-            FixCommand(
-                command=cmd.get("command", ""),
-                description=cmd.get("description", ""),
-                risk_level=cmd.get("risk_level", "LOW"),
+            FixCommand.model_construct(
+                command=str(cmd.get("command", "")),
+                description=str(cmd.get("description", "")),
+                risk_level=str(cmd.get("risk_level", "LOW")),
             )
             for cmd in analysis.get("fix_commands", [])
         ]
 
         related_runbooks = [
-            RelatedRunbook(title=rb, filename=rb, relevance_score=0.8)
+            RelatedRunbook.model_construct(title=rb, filename=rb, relevance_score=0.8)
             if isinstance(rb, str)
             else RelatedRunbook(**rb)
             for rb in analysis.get("related_runbooks", [])
         ]
 
-        # Map severity and category from analysis
-        try:
-            severity = Severity(analysis.get("severity", "MEDIUM"))
-        except ValueError:
+        # Map severity and category from analysis (dict lookups — no ValueError on unknown values)
+        severity = _SEVERITY_BY_VALUE.get(str(analysis.get("severity", "MEDIUM")))
+        if severity is None:
             severity = get_highest_severity(classifications) if classifications else Severity.MEDIUM
 
-        try:
-            error_category = ErrorCategory(analysis.get("error_category", "Unknown"))
-        except ValueError:
-            error_category = ErrorCategory.UNKNOWN
+        error_category = _CATEGORY_BY_VALUE.get(str(analysis.get("error_category", "Unknown")), ErrorCategory.UNKNOWN)
 
-        return DiagnoseResponse(
+        # Serialize once here instead of FastAPI re-validating via response_model
+        response = DiagnoseResponse.model_construct(
             request_id=request_id,
             severity=severity,
             error_category=error_category,
-            root_cause=analysis.get("root_cause", "Unknown"),
-            explanation=analysis.get("explanation", "No analysis available"),
+            root_cause=str(analysis.get("root_cause", "Unknown")),
+            explanation=str(analysis.get("explanation", "No analysis available")),
             fix_commands=fix_commands,
-            prevention_tips=analysis.get("prevention_tips", []),
+            prevention_tips=[str(tip) for tip in analysis.get("prevention_tips", [])],
             related_runbooks=related_runbooks,
             k8s_context=k8s_data if k8s_data else None,
             classified_errors=classifications if classifications else None,
         )
+        return UTCORJSONResponse(response.model_dump(mode="json"))
 
     except Exception as e:
         logger.error(f"[{request_id}] Diagnosis failed: {e}", exc_info=True)
@@ -174,20 +257,21 @@ async def diagnose(request: Request, body: DiagnoseRequest):
 # GET /cluster-health
 # ──────────────────────────────────────────────────────────────────────────────
 
-@app.get("/cluster-health", response_model=ClusterHealthResponse)
+@app.get("/cluster-health", response_model=None, responses={200: {"model": ClusterHealthResponse}})
 async def cluster_health():
     """Quick cluster-wide health check — nodes, unhealthy pods, warnings."""
     request_id = str(uuid.uuid4())[:8]
 
     if not is_k8s_available():
-        return ClusterHealthResponse(
+        response = ClusterHealthResponse(
             request_id=request_id,
             cluster_status="UNKNOWN",
             warnings=["Kubernetes is not configured. Cannot collect cluster health."],
         )
+        return UTCORJSONResponse(response.model_dump(mode="json"))
 
     try:
-        health = collect_cluster_health()
+        health = await collect_cluster_health()
 
         # Build node summaries
         node_issues = []
@@ -220,13 +304,14 @@ async def cluster_health():
         else:
             cluster_status = "HEALTHY"
 
-        return ClusterHealthResponse(
+        response = ClusterHealthResponse(
             request_id=request_id,
             cluster_status=cluster_status,
             total_nodes=total_nodes,
             ready_nodes=ready_nodes,
             node_issues=node_issues,
         )
+        return UTCORJSONResponse(response.model_dump(mode="json"))
 
     except Exception as e:
         logger.error(f"[{request_id}] Health check failed: {e}")
@@ -238,10 +323,11 @@ async def cluster_health():
 # ──────────────────────────────────────────────────────────────────────────────
 
 @limiter.limit(f"{settings.rate_limit_requests}/minute")
-@app.post("/suggest-runbook")
-async def suggest_runbook(request: Request, body: RunbookRequest):
+@app.post("/suggest-runbook", openapi_extra=_body_schema(RunbookRequest))
+async def suggest_runbook(request: Request, body: RunbookRequest = _RUNBOOK_BODY):
     """Search internal runbooks for a matching error."""
-    results = search_runbooks(body.error_message, top_k=body.top_k)
+    # Off the event loop: a vector-index miss makes a blocking embedding call
+    results = await asyncio.to_thread(search_runbooks, body.error_message, top_k=body.top_k)
     return {
         "query": body.error_message,
         "results": results,
@@ -270,10 +356,10 @@ def health_check():
 # ──────────────────────────────────────────────────────────────────────────────
 
 @limiter.limit(f"{settings.rate_limit_requests}/minute")
-@app.post("/analyze-error")
-async def analyze_error_legacy(req: Request, body: DiagnoseRequest):
+@app.post("/analyze-error", openapi_extra=_body_schema(DiagnoseRequest))
+async def analyze_error_legacy(request: Request, body: DiagnoseRequest = _DIAGNOSE_BODY):
     """Legacy endpoint — redirects to /diagnose."""
-    return await diagnose(req, body)
+    return await diagnose(request, body)
 
 
 # ──────────────────────────────────────────────────────────────────────────────
@@ -282,9 +368,19 @@ async def analyze_error_legacy(req: Request, body: DiagnoseRequest):
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(
-        "main:app",
-        host=settings.app_host,
-        port=settings.app_port,
-        reload=True,
-    )
+
+    if settings.dev_mode:
+        uvicorn.run(
+            "main:app",
+            host=settings.app_host,
+            port=settings.app_port,
+            reload=True,
+        )
+    else:
+        uvicorn.run(
+            "main:app",
+            host=settings.app_host,
+            port=settings.app_port,
+            workers=settings.app_workers,
+            log_config=None,  # keep the logging.basicConfig format above
+        )
@@ -3,7 +3,12 @@
 from enum import Enum
 from typing import List, Optional, Dict, Any
 from pydantic import BaseModel, Field
-from datetime import datetime
+from datetime import datetime, timezone
+
+
+def _iso_now() -> str:
+    """Current UTC time as ISO-8601 with millisecond precision and explicit offset."""
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds")
 
 
 # ──────────────────────────────────────────────────────────────────────────────
@@ -75,7 +80,7 @@ class RelatedRunbook(BaseModel):
 class DiagnoseResponse(BaseModel):
     """Structured diagnosis output — the main response from /diagnose."""
     request_id: str
-    timestamp: str = Field(default_factory=lambda: datetime.utcnow().isoformat())
+    timestamp: str = Field(default_factory=_iso_now)
     severity: Severity
     error_category: ErrorCategory
     root_cause: str = Field(..., description="One-line root cause summary")
@@ -109,7 +114,7 @@ class NodeHealthSummary(BaseModel):
 class ClusterHealthResponse(BaseModel):
     """Quick cluster-wide health summary."""
     request_id: str
-    timestamp: str = Field(default_factory=lambda: datetime.utcnow().isoformat())
+    timestamp: str = Field(default_factory=_iso_now)
     cluster_status: str  # HEALTHY / DEGRADED / CRITICAL
     total_nodes: int = 0
     ready_nodes: int = 0
@@ -4,23 +4,45 @@ Loads runbook documents, performs semantic search, and generates structured diag
 """
 
 import os
+import re
+import asyncio
+import copy
 import json
+import time
+import hashlib
+import threading
+import math
+import itertools
 import logging
 import glob
-from typing import List, Dict, Any, Optional
+import functools
+from collections import Counter, OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple, AbstractSet, Iterable
 
-from langchain_google_genai import ChatGoogleGenerativeAI
 try:
-    from langchain_core.messages import HumanMessage, SystemMessage
+    import orjson
 except ImportError:
-    from langchain.schema import HumanMessage, SystemMessage  # type: ignore
+    orjson = None  # type: ignore
 
 from config import settings
 from models import Severity, ErrorCategory
-from log_analyzer import format_classifications_for_prompt
+from log_analyzer import digest_lru_cache, format_classifications_for_prompt
 
 logger = logging.getLogger(__name__)
 
+
+def _to_json(obj: Any) -> str:
+    """Pretty-print prompt context as JSON; uses orjson when installed."""
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_NAIVE_UTC
+        return orjson.dumps(obj, default=str, option=option).decode()
+    return json.dumps(obj, indent=2, default=str)
+
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so one except clause covers both.
+_from_json = orjson.loads if orjson is not None else json.loads
+
 # ──────────────────────────────────────────────────────────────────────────────
 # System prompt — expert SRE with structured output
 # ──────────────────────────────────────────────────────────────────────────────
@@ -65,72 +87,491 @@ Rules:
 # Runbook loader — loads markdown files into a simple in-memory store
 # ──────────────────────────────────────────────────────────────────────────────
 
-_runbook_cache: List[Dict[str, str]] = []
+_runbook_cache: List[Dict[str, Any]] = []
+_runbook_index: Optional["_BM25Index"] = None
+_runbook_generation = 0  # Bumped on every (re)load; part of the response cache key
+_runbook_lock = threading.Lock()
+_RUNBOOK_READ_WORKERS = 16
+
+_TOKEN_RE = re.compile(r"\w+")
+# Queries are often whole stack traces: keep only the most frequent 3+ char tokens.
+_QUERY_TOKEN_RE = re.compile(r"[a-z0-9_]{3,}")
+_MAX_QUERY_TOKENS = 64
+_BM25_K1 = 1.5
+_BM25_B = 0.75
+
+
+class _BM25Index:
+    """
+    Okapi BM25 over the loaded runbooks. Per-term document weights are
+    precomputed into postings lists, so scoring a query is a sum over the
+    postings of its terms — no per-query pass over runbook text.
+    """
+
+    def __init__(self, documents: List[str]):
+        """Build postings from already-lowercased document texts."""
+        term_freqs = [Counter(_TOKEN_RE.findall(doc)) for doc in documents]
+        doc_lens = [sum(tf.values()) for tf in term_freqs]
+        avg_len = (sum(doc_lens) / len(doc_lens)) if doc_lens else 0.0
+        doc_freq = Counter(term for tf in term_freqs for term in tf)
+        n_docs = len(documents)
+
+        self.postings: Dict[str, List[Tuple[int, float]]] = defaultdict(list)
+        for doc_id, (tf, doc_len) in enumerate(zip(term_freqs, doc_lens, strict=True)):
+            norm = _BM25_K1 * (1 - _BM25_B + _BM25_B * doc_len / avg_len) if avg_len else _BM25_K1
+            for term, freq in tf.items():
+                idf = math.log(1 + (n_docs - doc_freq[term] + 0.5) / (doc_freq[term] + 0.5))
+                self.postings[term].append((doc_id, idf * freq * (_BM25_K1 + 1) / (freq + norm)))
+
+    def score(self, terms: AbstractSet[str]) -> Dict[int, float]:
+        """Return {doc_id: score} for documents matching at least one of the (unique) terms."""
+        scores: Dict[int, float] = defaultdict(float)
+        for term in terms:
+            for doc_id, weight in self.postings.get(term, ()):
+                scores[doc_id] += weight
+        return scores
+
 
+_SECTION_RE = re.compile(r"(?m)^##\s+")
+_SLUG_RE = re.compile(r"[^a-z0-9]+")
 
-def load_runbooks() -> List[Dict[str, str]]:
-    """Load all runbook markdown files from the runbook directory."""
-    global _runbook_cache
-    if _runbook_cache:
+
+def _split_sections(content: str) -> List[Tuple[str, str]]:
+    """
+    Split a runbook on its "## " headings into (heading, section_text) pairs.
+    Text before the first heading is kept under an empty heading only if it
+    holds more than the "# Title" line.
+    """
+    preamble, *sections = _SECTION_RE.split(content)
+    chunks = []
+    if preamble.partition("\n")[2].strip():
+        chunks.append(("", preamble))
+    for section in sections:
+        heading = section.partition("\n")[0].strip()
+        chunks.append((heading, "## " + section))
+    return chunks
+
+
+def _read_runbook(filepath: str) -> List[Tuple[Dict[str, Any], str]]:
+    """
+    Read a runbook file and build one cache entry per section. Each section's
+    lowercased text (prefixed with the title so it counts as context) is
+    returned for indexing, not retained.
+    """
+    with open(filepath, "r", encoding="utf-8") as f:
+        content = f.read()
+
+    filename = os.path.basename(filepath)
+    title = content.partition("\n")[0].replace("#", "").strip()
+    entries = []
+    anchors: Counter = Counter()
+    for heading, section in _split_sections(content):
+        anchor = _SLUG_RE.sub("-", heading.lower()).strip("-") or "top"
+        anchors[anchor] += 1
+        if anchors[anchor] > 1:
+            anchor = f"{anchor}-{anchors[anchor]}"
+        indexed_lower = f"{title}\n{section}".lower()
+        body = section.partition("\n")[2].strip() if heading else section
+        entries.append(({
+            "filename": filename,
+            "title": title,
+            "heading": heading,
+            "section": f"{filename}#{anchor}",
+            "content": section,
+            "summary": body[:200] + "...",
+        }, indexed_lower))
+    return entries
+
+
+def _read_one(filepath: str) -> List[Tuple[Dict[str, Any], str]]:
+    """_read_runbook for pool workers; logs and skips unreadable files."""
+    try:
+        return _read_runbook(filepath)
+    except Exception as e:
+        logger.error(f"Failed to load runbook {filepath}: {e}")
+        return []
+
+
+def load_runbooks() -> List[Dict[str, Any]]:
+    """Load all runbook markdown files from the runbook directory, one entry per "## " section."""
+    global _runbook_index, _runbook_generation, _vector_collection
+    if _runbook_cache:  # Fast path: already published, no lock needed
         return _runbook_cache
 
-    runbook_path = os.path.join(os.path.dirname(__file__), settings.runbook_dir)
-    if not os.path.exists(runbook_path):
-        logger.warning(f"Runbook directory not found: {runbook_path}")
+    with _runbook_lock:
+        if _runbook_cache:
+            return _runbook_cache
+
+        runbook_path = os.path.join(os.path.dirname(__file__), settings.runbook_dir)
+        if not os.path.exists(runbook_path):
+            logger.warning(f"Runbook directory not found: {runbook_path}")
+            return []
+
+        # File reads release the GIL, so a small pool overlaps their I/O waits.
+        files = glob.glob(os.path.join(runbook_path, "*.md"))
+        with ThreadPoolExecutor(max_workers=min(_RUNBOOK_READ_WORKERS, len(files) or 1)) as pool:
+            loaded = [chunk for chunks in pool.map(_read_one, files) for chunk in chunks]
+
+        runbooks = [runbook for runbook, _ in loaded]
+        _runbook_index = _BM25Index([content_lower for _, content_lower in loaded])
+        if settings.vector_search_enabled and settings.google_api_key and runbooks:
+            try:
+                _vector_collection = _build_vector_index(runbooks)
+            except Exception as e:
+                logger.warning(f"Vector index unavailable, using BM25: {e}")
+                _vector_collection = None
+        _runbook_generation += 1
+        _search_runbooks_cached.cache_clear()
+        # Publish in one slice assignment so lock-free readers never see a partial list
+        _runbook_cache[:] = runbooks
+        logger.info(f"Loaded {len(files)} runbooks as {len(_runbook_cache)} sections")
+        return _runbook_cache
+
+
+def _search_result(runbook: Dict[str, Any], relevance_score: float) -> Dict[str, Any]:
+    return {
+        "title": runbook["title"],
+        "filename": runbook["filename"],
+        "heading": runbook["heading"],
+        "section": runbook["section"],
+        "relevance_score": relevance_score,
+        "summary": runbook["summary"],
+    }
+
+
+def _best_per_file(ranked: Iterable[Tuple[Dict[str, Any], float]], top_k: int) -> List[Tuple[Dict[str, Any], float]]:
+    """Keep the first (best) section of each runbook file from a best-first ranking."""
+    if top_k <= 0:
         return []
+    seen = set()
+    picked = []
+    for runbook, score in ranked:
+        if runbook["filename"] in seen:
+            continue
+        seen.add(runbook["filename"])
+        picked.append((runbook, score))
+        if len(picked) == top_k:
+            break
+    return picked
+
 
-    for filepath in glob.glob(os.path.join(runbook_path, "*.md")):
+def search_runbooks(query: str, top_k: int = 3) -> List[Dict[str, Any]]:
+    """
+    Runbook search. Uses the ChromaDB vector index when VECTOR_SEARCH_ENABLED
+    and it built successfully; otherwise BM25 keyword search, with
+    relevance_score normalized to the best match. At most one section
+    (the best-scoring) is returned per runbook file.
+    Results are memoized per (query, top_k); callers get fresh copies.
+    """
+    return [dict(r) for r in _search_runbooks_cached(query, top_k)]
+
+
+@digest_lru_cache(maxsize=1024)
+def _search_runbooks_cached(query: str, top_k: int) -> Tuple[Dict[str, Any], ...]:
+    runbooks = load_runbooks()
+    if not runbooks or _runbook_index is None:
+        return ()
+
+    if _vector_collection is not None:
         try:
-            with open(filepath, "r") as f:
-                content = f.read()
-            _runbook_cache.append({
-                "filename": os.path.basename(filepath),
-                "title": content.split("\n")[0].replace("#", "").strip(),
-                "content": content,
-            })
+            return _vector_search(query, top_k, runbooks)
         except Exception as e:
-            logger.error(f"Failed to load runbook {filepath}: {e}")
+            logger.warning(f"Vector search failed, falling back to BM25: {e}")
 
-    logger.info(f"Loaded {len(_runbook_cache)} runbooks")
-    return _runbook_cache
+    qtokens = frozenset(
+        token for token, _ in Counter(_QUERY_TOKEN_RE.findall(query.lower())).most_common(_MAX_QUERY_TOKENS)
+    )
+    scores = _runbook_index.score(qtokens)
+    if not scores:
+        return ()
 
+    best = max(scores.values())
+    ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+    return tuple(
+        _search_result(runbook, score / best if best > 0 else 0.0)
+        for runbook, score in _best_per_file(((runbooks[doc_id], score) for doc_id, score in ranked), top_k)
+    )
 
-def search_runbooks(query: str, top_k: int = 3) -> List[Dict[str, Any]]:
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Vector index — optional ChromaDB similarity search over runbook embeddings
+# ──────────────────────────────────────────────────────────────────────────────
+
+_CHROMA_COLLECTION = "runbooks"
+_CHROMA_BATCH_SIZE = 128
+_VECTOR_OVERFETCH = 4  # Sections fetched per requested result, before per-file dedup
+
+_vector_collection = None  # chromadb Collection once built; BM25 serves queries until then
+_embedder = None
+
+
+def _get_embedder() -> Any:
+    """Shared Gemini embeddings client (lazy import)."""
+    global _embedder
+    if _embedder is None:
+        from langchain_google_genai import GoogleGenerativeAIEmbeddings
+
+        _embedder = GoogleGenerativeAIEmbeddings(
+            model=settings.embedding_model,
+            google_api_key=settings.google_api_key,
+        )
+    return _embedder
+
+
+def _build_vector_index(runbooks: List[Dict[str, Any]]) -> Any:
     """
-    Simple keyword-based runbook search.
-    In production, replace with ChromaDB vector similarity search.
+    Sync runbook sections into a persistent Chroma collection. Only new or
+    changed sections are embedded (one batched call), inserts go in batches,
+    and entries for deleted sections are removed. Each uvicorn worker runs
+    this at startup, so the sync holds an exclusive file lock on the persist
+    directory: the first worker embeds, the rest find the digests current.
     """
-    runbooks = load_runbooks()
-    if not runbooks:
-        return []
+    import fcntl
+
+    import chromadb
+
+    os.makedirs(settings.chroma_persist_dir, exist_ok=True)
+    with open(os.path.join(settings.chroma_persist_dir, ".sync.lock"), "w") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            return _sync_vector_index(chromadb.PersistentClient(path=settings.chroma_persist_dir), runbooks)
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _sync_vector_index(chroma: Any, runbooks: List[Dict[str, Any]]) -> Any:
+    collection = chroma.get_or_create_collection(_CHROMA_COLLECTION, metadata={"hnsw:space": "cosine"})
+
+    digests = {rb["section"]: hashlib.blake2b(rb["content"].encode(), digest_size=16).hexdigest() for rb in runbooks}
+    existing = collection.get(include=["metadatas"])
+    stored = {id_: (meta or {}).get("digest") for id_, meta in zip(existing["ids"], existing["metadatas"], strict=True)}
+
+    stale = [id_ for id_ in stored if id_ not in digests]
+    if stale:
+        collection.delete(ids=stale)
+
+    changed = [rb for rb in runbooks if stored.get(rb["section"]) != digests[rb["section"]]]
+    if changed:
+        embeddings = _get_embedder().embed_documents([f"{rb['title']}\n{rb['content']}" for rb in changed])
+        for start in range(0, len(changed), _CHROMA_BATCH_SIZE):
+            batch = changed[start:start + _CHROMA_BATCH_SIZE]
+            collection.upsert(
+                ids=[rb["section"] for rb in batch],
+                embeddings=embeddings[start:start + _CHROMA_BATCH_SIZE],
+                metadatas=[{"digest": digests[rb["section"]]} for rb in batch],
+            )
+    logger.info(f"Vector index ready: {len(runbooks)} sections, {len(changed)} embedded, {len(stale)} removed")
+    return collection
+
+
+def _vector_search(query: str, top_k: int, runbooks: List[Dict[str, Any]]) -> Tuple[Dict[str, Any], ...]:
+    """Nearest runbook sections by cosine distance; relevance_score is 1 - distance."""
+    by_section = {rb["section"]: rb for rb in runbooks}
+    # Over-fetch so top_k distinct files survive per-file deduplication
+    result = _vector_collection.query(
+        query_embeddings=[_get_embedder().embed_query(query)],
+        n_results=min(top_k * _VECTOR_OVERFETCH, len(runbooks)),
+        include=["distances"],
+    )
+    ranked = (
+        (by_section[id_], min(max(1.0 - distance, 0.0), 1.0))
+        for id_, distance in zip(result["ids"][0], result["distances"][0], strict=True)
+        if id_ in by_section
+    )
+    return tuple(_search_result(runbook, score) for runbook, score in _best_per_file(ranked, top_k))
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Response cache — exact-match reuse of LLM diagnoses
+# ──────────────────────────────────────────────────────────────────────────────
+
+_response_cache: "OrderedDict[bytes, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+_response_cache_lock = threading.Lock()
+
+
+def _response_cache_key(
+    error_context: str,
+    classifications: Optional[List[Dict[str, Any]]],
+    k8s_data: Optional[Dict[str, Any]],
+) -> bytes:
+    """Stable digest of the analysis inputs and the loaded runbook generation."""
+    payload = [_runbook_generation, error_context, classifications, k8s_data]
+    if orjson is not None:
+        raw = orjson.dumps(payload, default=str, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+    else:
+        raw = json.dumps(payload, sort_keys=True, default=str).encode()
+    return hashlib.blake2b(raw, digest_size=16).digest()
+
+
+def _response_cache_get(key: bytes) -> Optional[Dict[str, Any]]:
+    """Return a copy of a live cached response, or None."""
+    with _response_cache_lock:
+        entry = _response_cache.get(key)
+        if entry is None:
+            return None
+        expires_at, response = entry
+        if expires_at <= time.monotonic():
+            del _response_cache[key]
+            return None
+        _response_cache.move_to_end(key)
+        return copy.deepcopy(response)
+
+
+def _response_cache_put(key: bytes, response: Dict[str, Any]) -> None:
+    """Store a response, evicting the least recently used entries beyond llm_cache_size."""
+    with _response_cache_lock:
+        _response_cache[key] = (time.monotonic() + settings.llm_cache_ttl, copy.deepcopy(response))
+        _response_cache.move_to_end(key)
+        while len(_response_cache) > settings.llm_cache_size:
+            _response_cache.popitem(last=False)
+
+
+class _SemanticCache:
+    """
+    Second-tier cache keyed by query embeddings. Unit vectors live in one
+    float32 matrix so a lookup is a single mat-vec; the oldest row is
+    overwritten once capacity is reached.
+    """
+
+    def __init__(self, capacity: int, threshold: float):
+        self.capacity = capacity
+        self.threshold = threshold
+        self._embeds = None  # np.ndarray of shape (capacity, dim), allocated on first store
+        self._entries: List[Optional[Tuple[float, int, Dict[str, Any]]]] = [None] * capacity
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def lookup(self, query_vec: Any) -> Optional[Dict[str, Any]]:
+        """Return a copy of the most similar live response above threshold, or None."""
+        import numpy as np
+
+        with self._lock:
+            if self._embeds is None:
+                return None
+            sims = self._embeds @ query_vec
+            best = int(np.argmax(sims))
+            entry = self._entries[best]
+            if entry is None or sims[best] < self.threshold:
+                return None
+            expires_at, generation, response = entry
+            if expires_at <= time.monotonic() or generation != _runbook_generation:
+                return None
+            return copy.deepcopy(response)
+
+    def store(self, query_vec: Any, response: Dict[str, Any]) -> None:
+        import numpy as np
+
+        if self.capacity <= 0:  # SEMANTIC_CACHE_SIZE=0 disables the tier
+            return
+        with self._lock:
+            if self._embeds is None or self._embeds.shape[1] != query_vec.shape[0]:
+                self._embeds = np.zeros((self.capacity, query_vec.shape[0]), dtype=np.float32)
+                self._entries = [None] * self.capacity
+                self._next = 0
+            slot = self._next
+            self._embeds[slot] = query_vec
+            self._entries[slot] = (time.monotonic() + settings.llm_cache_ttl, _runbook_generation, copy.deepcopy(response))
+            self._next = (slot + 1) % self.capacity
+
+
+_semantic_cache: Optional[_SemanticCache] = None
+
+
+def _semantic_cache_lookup(error_context: str) -> Tuple[Optional[Any], Optional[Dict[str, Any]]]:
+    """Embed the query and check the semantic cache; returns (query_vec, cached_response)."""
+    global _semantic_cache
+    try:
+        import numpy as np
+
+        if _semantic_cache is None:
+            _semantic_cache = _SemanticCache(settings.semantic_cache_size, settings.semantic_cache_threshold)
+        query_vec = np.asarray(_get_embedder().embed_query(error_context), dtype=np.float32)
+        query_vec /= np.linalg.norm(query_vec) or 1.0
+    except Exception as e:
+        logger.warning(f"Semantic cache unavailable: {e}")
+        return None, None
+    return query_vec, _semantic_cache.lookup(query_vec)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# LLM client — one shared instance so its HTTP session is reused across requests
+# ──────────────────────────────────────────────────────────────────────────────
 
-    scored = []
-    query_words = set(query.lower().split())
+_llm: Optional[Tuple[Tuple[Any, ...], Any]] = None  # (settings it was built from, client)
+_llm_lock = threading.Lock()
 
-    for rb in runbooks:
-        content_lower = rb["content"].lower()
-        # Score by keyword overlap
-        matches = sum(1 for word in query_words if word in content_lower)
-        if matches > 0:
-            scored.append({
-                "title": rb["title"],
-                "filename": rb["filename"],
-                "relevance_score": min(matches / max(len(query_words), 1), 1.0),
-                "summary": rb["content"][:200] + "...",
-            })
 
-    scored.sort(key=lambda x: x["relevance_score"], reverse=True)
-    return scored[:top_k]
+@functools.cache
+def _lazy_import_messages() -> Tuple[Any, Any]:
+    """Import (SystemMessage, HumanMessage) on first LLM call."""
+    try:
+        from langchain_core.messages import HumanMessage, SystemMessage
+    except ImportError:
+        from langchain.schema import HumanMessage, SystemMessage  # type: ignore
+    return SystemMessage, HumanMessage
+
+
+def _get_llm() -> Any:
+    """Return the shared chat client, rebuilding it only when the LLM settings change."""
+    global _llm
+    config_key = (
+        settings.google_api_key,
+        settings.gemini_model,
+        settings.llm_temperature,
+        settings.llm_max_output_tokens,
+    )
+    current = _llm
+    if current is not None and current[0] == config_key:
+        return current[1]
+
+    with _llm_lock:
+        if _llm is None or _llm[0] != config_key:
+            # Deferred: the langchain/Gemini/grpc stack is only needed once an API key is set
+            from langchain_google_genai import ChatGoogleGenerativeAI
+
+            _llm = (config_key, ChatGoogleGenerativeAI(
+                temperature=settings.llm_temperature,
+                model=settings.gemini_model,
+                max_output_tokens=settings.llm_max_output_tokens,
+                google_api_key=settings.google_api_key,
+            ))
+        return _llm[1]
 
 
 # ──────────────────────────────────────────────────────────────────────────────
 # Main RAG analysis function
 # ──────────────────────────────────────────────────────────────────────────────
 
-def analyze_devops_issue(
+def _tail_lines(text: str, n: int) -> str:
+    """Last n lines of the whitespace-stripped text, found by scanning back for newlines."""
+    end = len(text)
+    while end and text[end - 1].isspace():
+        end -= 1
+    lo = 0
+    while lo < end and text[lo].isspace():
+        lo += 1
+    # Newlines in leading whitespace are stripped away, so they don't count as line breaks
+    start = end
+    for _ in range(n):
+        start = text.rfind("\n", lo, start)
+        if start < 0:
+            return text[lo:end]
+    return text[start + 1:end]
+
+
+_PROMPT_HEADER = "\n--- Developer Error Report ---"
+_PROMPT_FOOTER = "\nAnalyze this error comprehensively and respond in the required JSON format.\n"
+
+
+def _format_classification_context(classifications: Optional[List[Dict[str, Any]]]) -> str:
+    return "\n\n" + format_classifications_for_prompt(classifications) if classifications else ""
+
+
+async def analyze_devops_issue(
     error_context: str,
     classifications: Optional[List[Dict[str, Any]]] = None,
     k8s_data: Optional[Dict[str, Any]] = None,
+    cacheable: bool = True,
 ) -> Dict[str, Any]:
     """
     Production RAG pipeline:
@@ -139,20 +580,39 @@ def analyze_devops_issue(
     3. Construct rich prompt with all context
     4. Call Gemini LLM for structured analysis
     5. Parse and return structured JSON
-    """
 
-    # 1. Search runbooks
-    matching_runbooks = search_runbooks(error_context)
+    Successful LLM diagnoses are reused for identical inputs unless cacheable
+    is False (e.g. when k8s_data is a live snapshot). Mock and fallback
+    responses are never cached.
+    """
+    cache_key = None
+    if cacheable and settings.llm_cache_ttl > 0 and settings.llm_cache_size > 0:
+        cache_key = _response_cache_key(error_context, classifications, k8s_data)
+        cached = _response_cache_get(cache_key)
+        if cached is not None:
+            logger.debug("Diagnosis served from response cache")
+            return cached
+
+    query_vec = None
+    if (cache_key is not None and settings.semantic_cache_enabled and settings.semantic_cache_size > 0
+            and settings.google_api_key):
+        query_vec, cached = await asyncio.to_thread(_semantic_cache_lookup, error_context)
+        if cached is not None:
+            logger.debug("Diagnosis served from semantic cache")
+            _response_cache_put(cache_key, cached)
+            return cached
+
+    # 1-2. Search runbooks and format pre-classifications concurrently
+    matching_runbooks, classification_context = await asyncio.gather(
+        asyncio.to_thread(search_runbooks, error_context),
+        asyncio.to_thread(_format_classification_context, classifications),
+    )
     runbook_context = ""
     if matching_runbooks:
-        runbook_context = "\n\nRelevant Internal Runbooks:\n"
+        runbook_parts = ["\n\nRelevant Internal Runbooks:\n"]
         for rb in matching_runbooks:
-            runbook_context += f"\n--- {rb['title']} ({rb['filename']}) ---\n{rb['summary']}\n"
-
-    # 2. Format pre-classifications
-    classification_context = ""
-    if classifications:
-        classification_context = "\n\n" + format_classifications_for_prompt(classifications)
+            runbook_parts.append(f"\n--- {rb['title']}: {rb['heading'] or 'Overview'} ({rb['filename']}) ---\n{rb['summary']}\n")
+        runbook_context = "".join(runbook_parts)
 
     # 3. Format K8s data
     k8s_context = ""
@@ -160,50 +620,50 @@ def analyze_devops_issue(
         # Include key parts, not the full blob to stay within token limits
         k8s_summary_parts = []
         if "containers" in k8s_data:
-            k8s_summary_parts.append(f"Container Statuses: {json.dumps(k8s_data['containers'], indent=2)}")
+            k8s_summary_parts.append(f"Container Statuses: {_to_json(k8s_data['containers'])}")
         if "events" in k8s_data:
-            k8s_summary_parts.append(f"Recent Events: {json.dumps(k8s_data['events'][:10], indent=2)}")
+            k8s_summary_parts.append(f"Recent Events: {_to_json(list(itertools.islice(k8s_data['events'], 10)))}")
         if "conditions" in k8s_data:
-            k8s_summary_parts.append(f"Deployment Conditions: {json.dumps(k8s_data['conditions'], indent=2)}")
+            k8s_summary_parts.append(f"Deployment Conditions: {_to_json(k8s_data['conditions'])}")
         if "resource_spec" in k8s_data:
-            k8s_summary_parts.append(f"Resource Spec: {json.dumps(k8s_data['resource_spec'], indent=2)}")
+            k8s_summary_parts.append(f"Resource Spec: {_to_json(k8s_data['resource_spec'])}")
         if "recent_logs" in k8s_data:
             # Truncate logs to last 50 lines for token economy
             logs = k8s_data["recent_logs"]
             if isinstance(logs, str):
-                log_lines = logs.strip().split("\n")[-50:]
-                k8s_summary_parts.append(f"Recent Pod Logs (last 50 lines):\n" + "\n".join(log_lines))
+                k8s_summary_parts.append("Recent Pod Logs (last 50 lines):\n" + _tail_lines(logs, 50))
 
         if k8s_summary_parts:
             k8s_context = "\n\nLive Kubernetes Cluster Data:\n" + "\n\n".join(k8s_summary_parts)
 
     # 4. Construct the full prompt
-    full_prompt = f"""
---- Developer Error Report ---
-{error_context}
-{classification_context}
-{k8s_context}
-{runbook_context}
-
-Analyze this error comprehensively and respond in the required JSON format.
-"""
+    full_prompt = "\n".join((
+        _PROMPT_HEADER, error_context, classification_context, k8s_context, runbook_context, _PROMPT_FOOTER,
+    ))
 
     # 5. Call Gemini LLM
     try:
         if settings.google_api_key:
-            chat = ChatGoogleGenerativeAI(
-                temperature=settings.llm_temperature,
-                model=settings.gemini_model,
-                max_output_tokens=settings.llm_max_output_tokens,
-                google_api_key=settings.google_api_key,
+            chat = _get_llm()
+            system_message_cls, human_message_cls = _lazy_import_messages()
+            # Stream so first-token latency is observable; the reply is parsed once complete
+            chunks: List[str] = []
+            started = time.perf_counter()
+            first_token_ms = 0.0
+            async for chunk in chat.astream([
+                system_message_cls(content=SYSTEM_PROMPT),
+                human_message_cls(content=full_prompt),
+            ]):
+                if not chunks:
+                    first_token_ms = (time.perf_counter() - started) * 1000
+                chunks.append(chunk.content)
+            logger.info(
+                f"LLM response: first token {first_token_ms:.0f} ms, "
+                f"total {(time.perf_counter() - started) * 1000:.0f} ms"
             )
-            result = chat.invoke([
-                SystemMessage(content=SYSTEM_PROMPT),
-                HumanMessage(content=full_prompt),
-            ])
 
             # Parse the JSON response
-            return _parse_llm_response(result.content, matching_runbooks)
+            parsed = _parse_llm_response("".join(chunks), matching_runbooks)
         else:
             # Mock response when no API key is set
             return _generate_mock_response(error_context, classifications, matching_runbooks)
@@ -212,6 +672,20 @@ Analyze this error comprehensively and respond in the required JSON format.
         logger.error(f"LLM call failed: {e}")
         return _generate_fallback_response(str(e), classifications, matching_runbooks)
 
+    # 6. Cache the reply — a cache write failure must not discard a good LLM answer
+    try:
+        if cache_key is not None:
+            _response_cache_put(cache_key, parsed)
+        if query_vec is not None:
+            _semantic_cache.store(query_vec, parsed)
+    except Exception as e:
+        logger.warning(f"Failed to cache LLM response: {e}")
+    return parsed
+
+
+# Matches a ```json / ``` fenced reply; the closing fence is optional for truncated output.
+_FENCE_RE = re.compile(r"^\s*```(?:json)?\s*(.*?)\s*(?:```)?\s*$", re.DOTALL)
+
 
 def _parse_llm_response(
     raw_response: str,
@@ -220,16 +694,10 @@ def _parse_llm_response(
     """Parse LLM JSON response with fallback handling."""
     try:
         # Clean potential markdown wrapping
-        cleaned = raw_response.strip()
-        if cleaned.startswith("```json"):
-            cleaned = cleaned[7:]
-        if cleaned.startswith("```"):
-            cleaned = cleaned[3:]
-        if cleaned.endswith("```"):
-            cleaned = cleaned[:-3]
-        cleaned = cleaned.strip()
+        fenced = _FENCE_RE.match(raw_response)
+        cleaned = fenced.group(1) if fenced else raw_response.strip()
 
-        parsed = json.loads(cleaned)
+        parsed = _from_json(cleaned)
 
         # Ensure required fields exist
         parsed.setdefault("root_cause", "Unable to determine root cause")
@@ -271,7 +739,7 @@ def _generate_mock_response(
         "root_cause": f"[MOCK] Detected {category} error pattern",
         "severity": severity,
         "error_category": category,
-        "explanation": f"[MOCK MODE — No GOOGLE_API_KEY set]\nDetected error patterns: {json.dumps(classifications or [], indent=2)}\n\nOriginal error:\n{error_context[:500]}",
+        "explanation": f"[MOCK MODE — No GOOGLE_API_KEY set]\nDetected error patterns: {_to_json(classifications or [])}\n\nOriginal error:\n{error_context[:500]}",
         "fix_commands": [
             {
                 "command": "kubectl describe pod <pod-name> -n <namespace>",
@@ -48,6 +48,11 @@ class TestDiagnoseEndpoint:
         r = api_client.post("/diagnose", json={})
         assert r.status_code == 422  # validation error
 
+    def test_diagnose_rejects_malformed_json(self, api_client: TestClient):
+        r = api_client.post("/diagnose", content=b"{not json", headers={"Content-Type": "application/json"})
+        assert r.status_code == 422
+        assert r.json()["detail"][0]["loc"][0] == "body"
+
     def test_diagnose_with_pod_name(self, api_client: TestClient):
         r = api_client.post(
             "/diagnose",
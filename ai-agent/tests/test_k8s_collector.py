@@ -0,0 +1,271 @@
+"""Unit tests for k8s_collector caching helpers (no cluster required)."""
+
+import asyncio
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+import k8s_collector
+from k8s_collector import (
+    _Informer,
+    _list_items,
+    _memoized_summary,
+    _read_log_tail,
+    _ttl_cached,
+    collect_pod_details,
+)
+
+
+def _obj(uid: str, name: str, resource_version: str = "1"):
+    return SimpleNamespace(metadata=SimpleNamespace(uid=uid, name=name, resource_version=resource_version))
+
+
+def _list_response(*objs, resource_version: str = "42"):
+    return SimpleNamespace(items=list(objs), metadata=SimpleNamespace(resource_version=resource_version))
+
+
+class TestInformer:
+    """Tests for the list half of the informer loop."""
+
+    async def test_relist_replaces_store(self):
+        async def list_fn(**kwargs):
+            return _list_response(_obj("a", "node-a"), _obj("b", "node-b"))
+
+        informer = _Informer("nodes", list_fn)
+        informer.store = {"stale": _obj("stale", "gone")}
+
+        resource_version = await informer._relist()
+
+        assert resource_version == "42"
+        assert informer.synced
+        assert set(informer.store) == {"a", "b"}
+
+    async def test_relist_drops_summaries_of_vanished_objects(self):
+        async def list_fn(**kwargs):
+            return _list_response(_obj("a", "node-a"))
+
+        informer = _Informer("nodes", list_fn)
+        informer.store = {"gone": _obj("gone", "node-gone")}
+        k8s_collector._summary_cache["gone"] = ("1", {"name": "node-gone"})
+
+        await informer._relist()
+        assert "gone" not in k8s_collector._summary_cache
+
+
+    async def test_failed_relist_marks_store_unsynced(self):
+        async def list_fn(**kwargs):
+            raise k8s_collector.client.ApiException(status=503, reason="Service Unavailable")
+
+        async def stop(_delay):
+            raise asyncio.CancelledError
+
+        informer = _Informer("nodes", list_fn)
+        informer.last_synced = time.monotonic()
+
+        with patch("k8s_collector.asyncio.sleep", stop), pytest.raises(asyncio.CancelledError):
+            await informer.run()
+        assert not informer.synced
+
+
+class TestMemoizedSummary:
+    """Tests for resourceVersion-keyed summary reuse."""
+
+    def test_reuses_summary_until_version_changes(self):
+        calls = []
+
+        def build(obj):
+            calls.append(obj.metadata.resource_version)
+            return {"name": obj.metadata.name}
+
+        first = _memoized_summary(_obj("u1", "pod", "5"), build)
+        again = _memoized_summary(_obj("u1", "pod", "5"), build)
+        changed = _memoized_summary(_obj("u1", "pod", "6"), build)
+
+        assert first is again
+        assert changed is not first
+        assert calls == ["5", "6"]
+
+    def test_evicts_least_recently_used_beyond_cap(self):
+        k8s_collector._summary_cache.clear()
+
+        def build(obj):
+            return {"name": obj.metadata.name}
+
+        with patch("k8s_collector._SUMMARY_CACHE_MAX", 2):
+            _memoized_summary(_obj("a", "pod", "1"), build)
+            _memoized_summary(_obj("b", "pod", "1"), build)
+            _memoized_summary(_obj("a", "pod", "1"), build)
+            _memoized_summary(_obj("c", "pod", "1"), build)
+
+        assert list(k8s_collector._summary_cache) == ["a", "c"]
+
+
+class TestListItems:
+    """Tests for _list_items cache/API selection."""
+
+    @pytest.fixture(autouse=True)
+    def clear_informers(self):
+        k8s_collector._informers.clear()
+        yield
+        k8s_collector._informers.clear()
+
+    async def test_falls_back_to_api_when_not_synced(self):
+        async def list_fn(**kwargs):
+            assert kwargs["resource_version"] == "0"
+            return _list_response(_obj("a", "from-api"))
+
+        k8s_collector._informers["nodes"] = _Informer("nodes", list_fn)
+        items = await _list_items("nodes", list_fn)
+        assert [i.metadata.name for i in items] == ["from-api"]
+
+    async def test_serves_from_cache_when_synced(self):
+        async def list_fn(**kwargs):
+            raise AssertionError("API should not be called when the cache is synced")
+
+        informer = _Informer("nodes", list_fn)
+        informer.store = {"a": _obj("a", "cached")}
+        informer.last_synced = time.monotonic()
+        k8s_collector._informers["nodes"] = informer
+
+        items = await _list_items("nodes", list_fn)
+        assert [i.metadata.name for i in items] == ["cached"]
+
+    async def test_stale_cache_falls_back_to_api(self):
+        async def list_fn(**kwargs):
+            return _list_response(_obj("a", "from-api"))
+
+        informer = _Informer("nodes", list_fn)
+        informer.store = {"a": _obj("a", "stale")}
+        informer.last_synced = time.monotonic() - 3 * k8s_collector.settings.k8s_resync_period
+        k8s_collector._informers["nodes"] = informer
+
+        items = await _list_items("nodes", list_fn)
+        assert [i.metadata.name for i in items] == ["from-api"]
+
+
+class _FakeLogResponse:
+    def __init__(self, chunks, status=200):
+        self.status = status
+        self.reason = "OK" if status == 200 else "Not Found"
+        self.released = False
+        self.content = SimpleNamespace(iter_chunked=self._iter_chunked)
+        self._chunks = chunks
+
+    async def _iter_chunked(self, size):
+        for chunk in self._chunks:
+            yield chunk
+
+    def release(self):
+        self.released = True
+
+
+class _FakeCoreV1:
+    def __init__(self, resp):
+        self.resp = resp
+
+    async def read_namespaced_pod_log(self, **kwargs):
+        assert kwargs["_preload_content"] is False
+        return self.resp
+
+
+class TestReadLogTail:
+    """Tests for bounded, streamed pod log reads."""
+
+    async def test_returns_full_log_when_small(self):
+        resp = _FakeLogResponse([b"line1\n", b"line2\n"])
+        logs = await _read_log_tail(_FakeCoreV1(resp), "pod", "default")
+        assert logs == "line1\nline2\n"
+        assert resp.released
+
+    async def test_keeps_only_whole_lines_of_the_tail(self):
+        resp = _FakeLogResponse([b"aaaa\nbbbb\n", b"cccc\ndddd\n"])
+        with patch.object(k8s_collector.settings, "k8s_log_max_bytes", 12):
+            logs = await _read_log_tail(_FakeCoreV1(resp), "pod", "default")
+        assert logs == "cccc\ndddd\n"
+
+    async def test_cut_on_line_boundary_keeps_first_line(self):
+        resp = _FakeLogResponse([b"aaaa\nbbbb\n", b"cccc\ndddd\n"])
+        with patch.object(k8s_collector.settings, "k8s_log_max_bytes", 10):
+            logs = await _read_log_tail(_FakeCoreV1(resp), "pod", "default")
+        assert logs == "cccc\ndddd\n"
+
+    async def test_error_status_raises_api_exception(self):
+        resp = _FakeLogResponse([], status=404)
+        with pytest.raises(k8s_collector.client.ApiException):
+            await _read_log_tail(_FakeCoreV1(resp), "pod", "default")
+        assert resp.released
+
+
+class TestCollectPodDetails:
+    """Concurrent pod/log/event fetches keep their per-branch fallbacks."""
+
+    async def test_failed_pod_read_keeps_logs_and_events(self):
+        class CoreV1:
+            async def read_namespaced_pod(self, **kwargs):
+                raise k8s_collector.client.ApiException(status=404, reason="Not Found")
+
+            async def read_namespaced_pod_log(self, **kwargs):
+                return _FakeLogResponse([b"boot\n"])
+
+            async def list_namespaced_event(self, **kwargs):
+                return SimpleNamespace(items=[])
+
+        with patch("k8s_collector._k8s_available", True), patch("k8s_collector.CORE_V1", CoreV1()):
+            result = await collect_pod_details("web-0", "default")
+
+        assert result["error"] == "Failed to fetch pod: Not Found"
+        assert result["recent_logs"] == "boot\n"
+        assert result["events"] == []
+
+
+class TestTtlCached:
+    """Tests for the single-flight TTL result cache."""
+
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        k8s_collector._result_cache.clear()
+        k8s_collector._result_locks.clear()
+        yield
+        k8s_collector._result_cache.clear()
+        k8s_collector._result_locks.clear()
+
+    async def test_concurrent_misses_share_one_fetch(self):
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return {"n": calls}
+
+        results = await asyncio.gather(*(_ttl_cached(("cluster",), fetch) for _ in range(5)))
+        assert calls == 1
+        assert all(r == {"n": 1} for r in results)
+
+    async def test_zero_ttl_disables_cache(self):
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            return {}
+
+        with patch.object(k8s_collector.settings, "k8s_health_cache_ttl", 0):
+            await _ttl_cached(("cluster",), fetch)
+            await _ttl_cached(("cluster",), fetch)
+        assert calls == 2
+
+    async def test_store_prunes_expired_and_caps_keys(self):
+        async def fetch():
+            return {}
+
+        k8s_collector._result_cache[("namespace", "stale")] = (time.monotonic() - 3600, {})
+        k8s_collector._result_locks[("namespace", "stale")] = asyncio.Lock()
+        with patch("k8s_collector._RESULT_CACHE_MAX_KEYS", 2):
+            for ns in ("a", "b", "c"):
+                await _ttl_cached(("namespace", ns), fetch)
+
+        assert list(k8s_collector._result_cache) == [("namespace", "b"), ("namespace", "c")]
+        assert set(k8s_collector._result_locks) == {("namespace", "b"), ("namespace", "c")}
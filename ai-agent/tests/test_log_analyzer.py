@@ -1,11 +1,16 @@
 """Unit tests for log_analyzer module."""
 
 import pytest
+from unittest.mock import patch
 
 from log_analyzer import (
+    ERROR_PATTERNS,
     classify_errors,
     get_highest_severity,
     format_classifications_for_prompt,
+    _classify_cached,
+    digest_lru_cache,
+    _matching_pattern_indexes,
 )
 from models import Severity, ErrorCategory
 
@@ -54,6 +59,11 @@ class TestClassifyErrors:
         result = classify_errors("Some random log message with no known patterns")
         assert result == []
 
+    def test_cached_results_are_independent_copies(self):
+        first = classify_errors("Container OOMKilled")
+        first[0]["severity"] = "LOW"
+        assert classify_errors("Container OOMKilled")[0]["severity"] == Severity.CRITICAL.value
+
     def test_multiple_patterns_sorted_by_severity(self):
         result = classify_errors(
             "OOMKilled and ImagePullBackOff and Readiness probe failed"
@@ -63,6 +73,78 @@ class TestClassifyErrors:
         assert result[0]["severity"] == Severity.CRITICAL.value
 
 
+class TestPatternPrefilter:
+    """The pattern prefilter must report every pattern a full regex scan finds."""
+
+    @pytest.fixture(params=["hyperscan", "per-pattern"], autouse=True)
+    def backend(self, request):
+        _classify_cached.cache_clear()
+        if request.param == "per-pattern":
+            with patch("log_analyzer._HS_DB", None):
+                yield
+        else:
+            yield
+
+    @pytest.mark.parametrize("text", [
+        "Container OOMKilled, exit code 137",
+        "Back-off pulling image: ErrImagePull; Liveness probe failed",
+        "Error: Error acquiring the state lock\nLock Info: ID: 1234",
+        "dial tcp 10.0.0.1:443: connect: connection refused (403 Forbidden)",
+        "Process completed with exit code 1: EACCES permission denied",
+        "Error: forbidden: exceeded quota: compute-resources",
+        "nothing to see here",
+    ])
+    def test_prefilter_agrees_with_full_scan(self, text):
+        expected = {i for i, entry in enumerate(ERROR_PATTERNS) if entry["pattern"].search(text)}
+        assert set(_matching_pattern_indexes(text)) >= expected
+
+    @pytest.mark.parametrize("text", [
+        "OOMKilled", "CrashLoopBackOff", "ErrImagePull", "CreateContainerConfigError",
+        "readinessProbe", "livenessProbe", "ResourceQuota", "RBAC", "403", "Unauthorized",
+        "dial tcp: i/o timeout", "ETIMEDOUT", "network unreachable", "Lock ID: 1",
+        "ConditionalCheckFailedException from terraform", "NoCredentialProviders",
+        "ExpiredToken", "InvalidClientTokenId", "exit code 2", "EACCES",
+    ])
+    def test_literal_prefilter_admits_every_pattern(self, text):
+        expected = {entry["category"].value for entry in ERROR_PATTERNS if entry["pattern"].search(text)}
+        assert expected
+        assert {c["category"] for c in classify_errors(text)} == expected
+
+
+class TestDigestLruCache:
+    """Tests for the digest-keyed memoization used for raw log inputs."""
+
+    def test_memoizes_per_text_and_args(self):
+        calls = []
+
+        @digest_lru_cache(maxsize=8)
+        def fn(text, n):
+            calls.append((text, n))
+            return len(text) * n
+
+        assert fn("abc", 2) == fn("abc", 2) == 6
+        assert fn("abc", 3) == 9
+        assert calls == [("abc", 2), ("abc", 3)]
+
+    def test_evicts_least_recently_used_beyond_maxsize(self):
+        calls = []
+
+        @digest_lru_cache(maxsize=2)
+        def fn(text):
+            calls.append(text)
+            return text.upper()
+
+        big = "x" * 1_000_000
+        for text in (big, "b", big, "c", "b"):
+            fn(text)
+
+        # "b" was evicted by "c" once big had been touched again
+        assert calls == [big, "b", "c", "b"]
+        fn.cache_clear()
+        fn(big)
+        assert calls[-1] is big
+
+
 class TestGetHighestSeverity:
     """Tests for get_highest_severity function."""
 
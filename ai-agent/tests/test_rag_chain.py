@@ -1,7 +1,11 @@
 """Unit tests for rag_chain module."""
 
+from types import SimpleNamespace
+from unittest.mock import patch
+
 import pytest
 
+import rag_chain
 from rag_chain import (
     load_runbooks,
     search_runbooks,
@@ -9,6 +13,7 @@ from rag_chain import (
     _parse_llm_response,
     _generate_mock_response,
     _generate_fallback_response,
+    _tail_lines,
 )
 
 
@@ -29,6 +34,23 @@ class TestLoadRunbooks:
         b = load_runbooks()
         assert a is b
 
+    def test_runbooks_split_into_sections(self):
+        sections = [rb for rb in load_runbooks() if rb["filename"] == "oomkilled.md"]
+        assert [rb["heading"] for rb in sections] == ["Symptoms", "Common Causes", "Diagnostic Commands", "Fix Steps"]
+        assert sections[0]["section"] == "oomkilled.md#symptoms"
+        assert all(rb["title"] == "OOMKilled" for rb in sections)
+        assert sections[0]["content"].startswith("## Symptoms")
+
+    def test_concurrent_first_loads_do_not_duplicate(self):
+        from concurrent.futures import ThreadPoolExecutor
+
+        expected = len(load_runbooks())
+        rag_chain._runbook_cache.clear()
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(lambda _: load_runbooks(), range(8)))
+        assert all(r is rag_chain._runbook_cache for r in results)
+        assert len(rag_chain._runbook_cache) == expected
+
 
 class TestSearchRunbooks:
     """Tests for search_runbooks function."""
@@ -46,16 +68,107 @@ class TestSearchRunbooks:
             assert "filename" in result[0]
             assert "relevance_score" in result[0]
 
+    def test_best_match_ranked_first(self):
+        result = search_runbooks("terraform state lock DynamoDB", top_k=3)
+        assert result[0]["filename"] == "terraform-state-lock.md"
+        assert result[0]["relevance_score"] == 1.0
+        assert all(0.0 < r["relevance_score"] <= 1.0 for r in result)
+
+    def test_one_section_per_runbook(self):
+        result = search_runbooks("terraform state lock DynamoDB kubectl pod", top_k=4)
+        filenames = [r["filename"] for r in result]
+        assert len(filenames) == len(set(filenames))
+        assert filenames[0] == "terraform-state-lock.md"
+
+    def test_non_positive_top_k_returns_nothing(self):
+        assert search_runbooks("OOMKilled", top_k=0) == []
+
+    def test_long_query_is_capped_to_frequent_tokens(self):
+        noise = " ".join(f"frame{i}" for i in range(500))
+        result = search_runbooks(f"OOMKilled OOMKilled memory limit {noise}", top_k=1)
+        assert result[0]["filename"] == "oomkilled.md"
+
     def test_top_k_respected(self):
         result = search_runbooks("pod container kubernetes", top_k=2)
         assert len(result) <= 2
 
 
+class TestVectorSearch:
+    """Tests for the optional Chroma-backed search path (collection faked)."""
+
+    class _FakeCollection:
+        def query(self, query_embeddings, n_results, include):
+            return {"ids": [["oomkilled.md#fix-steps", "missing.md#top"]], "distances": [[0.25, 0.1]]}
+
+    class _FakeEmbedder:
+        def embed_query(self, text):
+            return [1.0, 0.0]
+
+    @pytest.fixture(autouse=True)
+    def fake_index(self):
+        rag_chain._search_runbooks_cached.cache_clear()
+        with patch("rag_chain._vector_collection", self._FakeCollection()), \
+                patch("rag_chain._get_embedder", self._FakeEmbedder):
+            yield
+        rag_chain._search_runbooks_cached.cache_clear()
+
+    def test_maps_hits_to_loaded_runbooks(self):
+        result = search_runbooks("pod ran out of memory", top_k=2)
+        assert [r["section"] for r in result] == ["oomkilled.md#fix-steps"]
+        assert result[0]["relevance_score"] == 0.75
+
+    def test_falls_back_to_bm25_on_error(self):
+        with patch.object(self._FakeCollection, "query", side_effect=RuntimeError("chroma down")):
+            result = search_runbooks("OOMKilled memory", top_k=1)
+        assert result[0]["filename"] == "oomkilled.md"
+
+
+class _FakeChromaCollection:
+    def __init__(self):
+        self.rows = {}
+
+    def get(self, include):
+        return {"ids": list(self.rows), "metadatas": list(self.rows.values())}
+
+    def delete(self, ids):
+        for id_ in ids:
+            self.rows.pop(id_)
+
+    def upsert(self, ids, embeddings, metadatas):
+        self.rows.update(zip(ids, metadatas, strict=True))
+
+
+class TestBuildVectorIndex:
+    """Tests for the locked Chroma sync (chromadb module faked)."""
+
+    def test_second_sync_embeds_nothing(self, tmp_path):
+        collection = _FakeChromaCollection()
+        chromadb = SimpleNamespace(PersistentClient=lambda path: SimpleNamespace(
+            get_or_create_collection=lambda name, metadata: collection,
+        ))
+        embedded = []
+
+        class Embedder:
+            def embed_documents(self, texts):
+                embedded.append(len(texts))
+                return [[1.0, 0.0]] * len(texts)
+
+        runbooks = load_runbooks()
+        with patch.dict("sys.modules", {"chromadb": chromadb}), \
+                patch.object(rag_chain.settings, "chroma_persist_dir", str(tmp_path)), \
+                patch("rag_chain._get_embedder", Embedder):
+            rag_chain._build_vector_index(runbooks)
+            rag_chain._build_vector_index(runbooks)
+
+        assert embedded == [len(runbooks)]
+        assert set(collection.rows) == {rb["section"] for rb in runbooks}
+
+
 class TestAnalyzeDevopsIssue:
     """Tests for analyze_devops_issue - uses mock when no API key."""
 
-    def test_mock_response_structure(self):
-        result = analyze_devops_issue(
+    async def test_mock_response_structure(self):
+        result = await analyze_devops_issue(
             error_context="Pod OOMKilled in production",
             classifications=[{"severity": "CRITICAL", "category": "OOMKilled", "hint": "Memory"}],
         )
@@ -67,8 +180,8 @@ class TestAnalyzeDevopsIssue:
         assert "prevention_tips" in result
         assert "related_runbooks" in result
 
-    def test_fix_commands_non_empty_in_mock(self):
-        result = analyze_devops_issue(
+    async def test_fix_commands_non_empty_in_mock(self):
+        result = await analyze_devops_issue(
             error_context="CrashLoopBackOff",
             classifications=[{"severity": "CRITICAL", "category": "CrashLoopBackOff", "hint": "Check logs"}],
         )
@@ -76,13 +189,100 @@ class TestAnalyzeDevopsIssue:
         assert "command" in result["fix_commands"][0]
         assert "description" in result["fix_commands"][0]
 
-    def test_with_classifications_passed_through(self):
+    async def test_with_classifications_passed_through(self):
         classifications = [{"severity": "HIGH", "category": "ImagePullBackOff", "hint": "Check image"}]
-        result = analyze_devops_issue("ImagePullBackOff", classifications=classifications)
+        result = await analyze_devops_issue("ImagePullBackOff", classifications=classifications)
         assert result["severity"] == "HIGH"
         assert result["error_category"] == "ImagePullBackOff"
 
 
+class _FakeChat:
+    """Stand-in for ChatGoogleGenerativeAI that counts invocations."""
+
+    calls = 0
+
+    def __init__(self, **kwargs):
+        pass
+
+    async def astream(self, messages):
+        type(self).calls += 1
+        for part in ('{"root_cause":"cached","severity":"HIGH",', '"fix_commands":[{"command":"kubectl get pods"}]}'):
+            yield SimpleNamespace(content=part)
+
+
+class TestResponseCache:
+    """Tests for the exact-match diagnosis cache."""
+
+    @pytest.fixture(autouse=True)
+    def fake_llm(self):
+        _FakeChat.calls = 0
+        rag_chain._response_cache.clear()
+        rag_chain._llm = None
+        with patch.object(rag_chain.settings, "google_api_key", "test-key"), \
+                patch("langchain_google_genai.ChatGoogleGenerativeAI", _FakeChat):
+            yield
+        rag_chain._response_cache.clear()
+        rag_chain._llm = None
+
+    async def test_repeat_request_skips_llm(self):
+        first = await analyze_devops_issue("Pod OOMKilled", classifications=[{"severity": "CRITICAL", "category": "OOMKilled", "hint": "Memory"}])
+        first["fix_commands"].clear()
+        second = await analyze_devops_issue("Pod OOMKilled", classifications=[{"severity": "CRITICAL", "category": "OOMKilled", "hint": "Memory"}])
+        assert _FakeChat.calls == 1
+        assert second["root_cause"] == "cached"
+        assert second["fix_commands"] == [{"command": "kubectl get pods"}]
+
+    async def test_uncacheable_request_always_calls_llm(self):
+        await analyze_devops_issue("Pod OOMKilled", k8s_data={"pod": "web-0"}, cacheable=False)
+        await analyze_devops_issue("Pod OOMKilled", k8s_data={"pod": "web-0"}, cacheable=False)
+        assert _FakeChat.calls == 2
+
+    def test_llm_client_reused_until_settings_change(self):
+        first = rag_chain._get_llm()
+        assert rag_chain._get_llm() is first
+        with patch.object(rag_chain.settings, "google_api_key", "rotated-key"):
+            assert rag_chain._get_llm() is not first
+
+    async def test_cache_write_failure_keeps_llm_reply(self):
+        with patch("rag_chain._response_cache_put", side_effect=RuntimeError("boom")):
+            result = await analyze_devops_issue("Pod OOMKilled")
+        assert result["root_cause"] == "cached"
+
+    async def test_fallback_responses_are_not_cached(self):
+        with patch.object(_FakeChat, "astream", side_effect=RuntimeError("quota exceeded")):
+            await analyze_devops_issue("Pod OOMKilled")
+        await analyze_devops_issue("Pod OOMKilled")
+        assert _FakeChat.calls == 1
+
+
+class TestSemanticCache:
+    """Tests for the embedding-similarity cache tier."""
+
+    def _unit(self, *values):
+        np = pytest.importorskip("numpy")
+        v = np.asarray(values, dtype=np.float32)
+        return v / np.linalg.norm(v)
+
+    def test_similar_query_hits(self):
+        cache = rag_chain._SemanticCache(capacity=4, threshold=0.9)
+        cache.store(self._unit(1.0, 0.0, 0.1), {"root_cause": "oom"})
+        assert cache.lookup(self._unit(1.0, 0.05, 0.1)) == {"root_cause": "oom"}
+        assert cache.lookup(self._unit(0.0, 1.0, 0.0)) is None
+
+    def test_oldest_entry_evicted_at_capacity(self):
+        cache = rag_chain._SemanticCache(capacity=2, threshold=0.99)
+        cache.store(self._unit(1.0, 0.0), {"n": 1})
+        cache.store(self._unit(0.0, 1.0), {"n": 2})
+        cache.store(self._unit(-1.0, 0.0), {"n": 3})
+        assert cache.lookup(self._unit(1.0, 0.0)) is None
+        assert cache.lookup(self._unit(0.0, 1.0)) == {"n": 2}
+
+    def test_zero_capacity_is_disabled(self):
+        cache = rag_chain._SemanticCache(capacity=0, threshold=0.9)
+        cache.store(self._unit(1.0, 0.0), {"n": 1})
+        assert cache.lookup(self._unit(1.0, 0.0)) is None
+
+
 class TestParseLlmResponse:
     """Tests for _parse_llm_response helper."""
 
@@ -97,6 +297,11 @@ class TestParseLlmResponse:
         result = _parse_llm_response(raw, [])
         assert result["root_cause"] == "a"
 
+    def test_bare_fence_with_surrounding_whitespace(self):
+        raw = '  \n```\n{"root_cause":"c"}\n```  \n'
+        result = _parse_llm_response(raw, [])
+        assert result["root_cause"] == "c"
+
 
 class TestFallbackResponse:
     """Tests for fallback when LLM fails."""
@@ -110,3 +315,19 @@ class TestFallbackResponse:
         assert "root_cause" in result
         assert result["severity"] == "HIGH"
         assert "Connection timeout" in result["explanation"] or "timeout" in result["explanation"].lower()
+
+
+class TestTailLines:
+    """Tests for _tail_lines log truncation."""
+
+    @pytest.mark.parametrize("text,n", [
+        ("", 50),
+        ("single line", 50),
+        ("  padded\n body \n\n", 50),
+        ("\n".join(f"line {i}" for i in range(120)) + "\n  ", 50),
+        ("\n" * 60 + "x", 50),
+        ("\n\nA\nB", 3),
+        ("\n \nA\nB\nC", 2),
+    ])
+    def test_matches_split_and_slice(self, text, n):
+        assert _tail_lines(text, n) == "\n".join(text.strip().split("\n")[-n:])
@@ -1,39 +1,60 @@
 """Tests for runbook presence and structure."""
 
+import functools
 import os
-import glob
 
 import pytest
 
 
-RUNBOOK_DIR = os.path.join(os.path.dirname(__file__), "..", "runbooks")
+RUNBOOK_DIR = os.path.realpath(os.path.join(os.path.dirname(__file__), "..", "runbooks"))
+HEAD_BYTES = 4096  # Structural checks only need the start of each file
 EXPECTED_RUNBOOKS = ["crashloopbackoff.md", "oomkilled.md", "imagepullbackoff.md", "terraform-state-lock.md"]
+EXPECTED_PATHS = tuple((name, os.path.join(RUNBOOK_DIR, name)) for name in EXPECTED_RUNBOOKS)
+
+
+def _read_head(path):
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        return os.read(fd, HEAD_BYTES)
+    finally:
+        os.close(fd)
+
+
+@pytest.fixture(scope="session")
+def runbook_contents():
+    """First HEAD_BYTES of each expected runbook, read once per session."""
+    return {path: _read_head(path) for _, path in EXPECTED_PATHS}
+
+
+@functools.cache
+def _entries():
+    """Runbook directory listing from a single scandir pass, keyed by name; shared by the module."""
+    with os.scandir(RUNBOOK_DIR) as it:
+        return {e.name: e for e in it}
 
 
 class TestRunbookExistence:
     """Ensure required runbooks exist."""
 
-    def test_runbook_dir_exists(self):
-        assert os.path.isdir(RUNBOOK_DIR), f"Runbook directory {RUNBOOK_DIR} not found"
-
-    def test_expected_runbooks_exist(self):
+    def test_runbooks_present_and_markdown(self):
+        try:
+            entries = _entries()
+        except FileNotFoundError:
+            pytest.fail(f"Runbook directory {RUNBOOK_DIR} not found")
+        assert entries, f"Runbook directory {RUNBOOK_DIR} is empty"
+        missing = set(EXPECTED_RUNBOOKS).difference(entries)
+        assert not missing, f"Expected runbooks {sorted(missing)} not found in {RUNBOOK_DIR}"
         for name in EXPECTED_RUNBOOKS:
-            path = os.path.join(RUNBOOK_DIR, name)
-            assert os.path.isfile(path), f"Expected runbook {name} not found at {path}"
-
-    def test_runbooks_are_markdown(self):
-        files = glob.glob(os.path.join(RUNBOOK_DIR, "*.md"))
-        assert len(files) >= len(EXPECTED_RUNBOOKS)
+            assert entries[name].is_file(), f"Expected runbook {name} is not a regular file"
+        assert sum(1 for name in entries if name.endswith(".md")) >= len(EXPECTED_RUNBOOKS)
 
 
 class TestRunbookStructure:
     """Basic structure validation."""
 
-    @pytest.mark.parametrize("runbook", EXPECTED_RUNBOOKS)
-    def test_runbook_has_content(self, runbook):
-        path = os.path.join(RUNBOOK_DIR, runbook)
-        with open(path) as f:
-            content = f.read()
+    @pytest.mark.parametrize("runbook, path", EXPECTED_PATHS, ids=EXPECTED_RUNBOOKS)
+    def test_runbook_has_content(self, runbook, path, runbook_contents):
+        content = runbook_contents[path]
         assert len(content.strip()) > 50, f"Runbook {runbook} seems empty or too short"
         # Typical runbooks have headers
-        assert "#" in content, f"Runbook {runbook} should have markdown headers"
+        assert b"#" in content, f"Runbook {runbook} should have markdown headers"